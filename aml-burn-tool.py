@@ -4,19 +4,22 @@ Amlogic SBC Burn Tool
 Event-driven FSM for automated image flashing via serial port and adnl_burn_pkg
 """
 
-import argparse
 import asyncio
-import json
+import errno
 import logging
+import logging.handlers
 import os
+import queue
 import re
+import selectors
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 
 try:
   import serial
@@ -26,10 +29,97 @@ except ImportError:
   sys.exit(1)
 
 try:
-  import requests
+  # Optional faster JSON parser for the config file; stdlib json is the fallback
+  import orjson
 except ImportError:
-  print("ERROR: requests not installed. Run: pip install requests")
-  sys.exit(1)
+  orjson = None
+
+try:
+  import fcntl
+except ImportError:
+  # Not available on Windows; pipes are then read from a thread
+  fcntl = None
+
+# Directory of this script (resolved once), holding the helper scripts and local config
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# requests (and urllib3/ssl behind it) is only needed for relay control,
+# so it is imported on first use by _get_requests()
+_requests = None
+
+
+def _get_requests():
+  """Import requests on first use"""
+  global _requests
+  if _requests is None:
+    try:
+      import requests
+    except ImportError:
+      print("ERROR: requests not installed. Run: pip install requests")
+      sys.exit(1)
+    _requests = requests
+  return _requests
+
+# Single-pass cleanup of serial lines, alternatives in priority order:
+# 1. ANSI escape codes (colors, cursor positions, queries, etc.)
+#    This includes: \x1b[31m, \x1b[2;3H, \x1b[?25h, \x1b[230;1R, etc.
+#    Must come first, otherwise the bare ESC would be eaten by (3)
+# 2. Standalone escape sequences like ;230R (cursor position responses)
+# 3. Any remaining control characters
+_CLEAN_RE = re.compile(r"\x1b\[[0-9;?]*[a-zA-Z]|;\d+R|[\x00-\x1f\x7f-\x9f]")
+
+# SGR color codes (\x1b[XXm) added by our own log formatting; stripped for log files
+_COLOR_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+# adnl_burn_pkg success message, any case (e.g. "Burn Successful^_^");
+# matched on raw output bytes without a lowered copy of each line
+_BURN_OK_RE = re.compile(rb"burn successful", re.IGNORECASE)
+
+# Relay address as used in http://<relay>/cm?...: IPv4 address or host name, optional port
+_RELAY_HOST_RE = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9.-]*[A-Za-z0-9])?(?::\d{1,5})?")
+
+# Kernel version signature in 'uname -a' output
+_KERNEL_SIG_RE = re.compile(r"Linux.*?(?:#1|SMP|PREEMPT|GNU/Linux)")
+
+
+def _strip_ansi(line: str) -> str:
+  """Remove ANSI escape codes and control characters from a serial line"""
+  return _CLEAN_RE.sub("", line)
+
+
+# Flags that can be scoped to part of a pattern with an inline "(?flags-flags:...)" group
+_SCOPED_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+
+
+def _scoped_pattern(pattern: re.Pattern) -> str:
+  """Return pattern's source wrapped in an inline group carrying its flags
+
+  Lets patterns with different flags be joined into one regex without
+  changing how each of them matches.
+  """
+  scopable = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE
+  assert not pattern.flags & ~(scopable | re.UNICODE), f"unsupported flags in {pattern.pattern!r}"
+  on = "".join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+  off = "".join(letter for flag, letter in _SCOPED_FLAGS if not pattern.flags & flag)
+  return f"(?{on}-{off}:{pattern.pattern})" if off else f"(?{on}:{pattern.pattern})"
+
+
+def _find_progress(line: bytes) -> Optional[int]:
+  """Return NN from the first adnl_burn_pkg progress marker "%NN.." in line, or None
+
+  Plain find/startswith scan instead of a regex search: no Match object per line.
+  """
+  i = line.find(b"%")
+  while i != -1:
+    j = i + 1
+    end = len(line)
+    while j < end and 48 <= line[j] <= 57:  # ASCII digits
+      j += 1
+    if j > i + 1 and line.startswith(b"..", j):
+      return int(line[i + 1:j])
+    i = line.find(b"%", i + 1)
+  return None
 
 
 class State(Enum):
@@ -70,11 +160,6 @@ class BurnTool:
         "FSM": "",
         "ADNL": "",
       }
-  
-  @property
-  def COLORS(self):
-    """Get color codes (property to check TTY each time)"""
-    return self._get_colors()
 
   # Pattern definitions for state detection
   PATTERNS = {
@@ -96,6 +181,27 @@ class BurnTool:
     "rebooting": re.compile(r"Rebooting\.|Restarting system", re.IGNORECASE),
   }
 
+  # All PATTERNS fused into one alternation with a named group per pattern,
+  # so a line that matches nothing (the common case) costs a single search.
+  # The group name of the match (m.lastgroup) is the pattern name, but the
+  # alternation reports the leftmost match in the line, not the first pattern
+  # in PATTERNS order; match_pattern() restores that priority.
+  # Each alternative carries its own pattern's flags as a scoped inline group
+  # (e.g. "(?i:...)").
+  COMBINED_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{_scoped_pattern(pattern)})" for name, pattern in PATTERNS.items())
+  )
+
+  # Pattern names grouped for membership tests in the FSM handlers
+  BOOTLOADER_STAGES = frozenset(("bl2", "bl31", "bl32"))
+  PROMPT_PATTERNS = frozenset(("uboot_prompt", "shell_prompt", "login_prompt"))
+
+  # Cheap pre-filter: every pattern above needs at least one of these
+  # characters/words, so lines without any of them (most kernel log spam)
+  # can be rejected without running COMBINED_PATTERN.
+  # Keep in sync with PATTERNS when adding new ones.
+  TRIGGER_PATTERN = re.compile(r"[#>:$_]|boot|bl|usb|restart", re.IGNORECASE)
+
   def __init__(
     self,
     serial_port: str,
@@ -105,12 +211,15 @@ class BurnTool:
   ):
     self.serial_port = serial_port
     self.baudrate = baudrate
-    self.image_path = Path(image_path)
+    self.image_path = image_path
     self.relay_ip = relay_ip
+    self._relay_http = None  # requests.Session for relay calls, created on first use
 
     self.state = State.INIT
     self.serial_conn: Optional[serial.Serial] = None
     self.adnl_process: Optional[subprocess.Popen] = None
+    self.adnl_task: Optional[asyncio.Task] = None  # Task running run_adnl_burn_pkg, set when the burn is started
+    self._progress_stall_handle: Optional[asyncio.TimerHandle] = None  # Burn progress stall timer
 
     # State tracking flags
     self.adnl_sent = False
@@ -126,38 +235,48 @@ class BurnTool:
     self.serial_log = self.session_log_dir / f"serial_{timestamp}.log"
     self.adnl_log = self.session_log_dir / f"adnl_{timestamp}.log"
     self.script_log = self.session_log_dir / f"script_{timestamp}.log"
-    self.board_info_md = self.session_log_dir / "board-info.md"
+    self.log_files: Dict[Path, Any] = {}  # Open handles for log_line, keyed by path
+    self.log_flush_interval = 0.25  # Flush buffered log lines every 250ms
+    self._log_ts_second = None  # Second for which _log_ts_prefix was formatted
+    self._log_ts_prefix = b""  # "YYYY-mm-dd HH:MM:SS" for log_line timestamps
+
+    # Color codes, also baked into the serial line format below
+    self._colors = self._get_colors()
+    # Log format for received serial lines (line number, line), %-formatted lazily by logging
+    self._serial_line_fmt = f"{self._colors['SERIAL']}[Serial #%d]{self._colors['RESET']} %s"
 
     # Setup logging
     self.setup_logging()
 
     # FSM state tracking
     self.state_history: list[tuple[float, State, str]] = []
-    self.last_activity = time.time()
+    self.last_activity = time.monotonic()
     self.timeout_seconds = 300  # 5 minutes timeout
     self.serial_reader_started = False
+    self.serial_reader_stop = threading.Event()  # Signals the serial reader thread to exit
     self.lines_received = 0
     self.initial_wake_sent = False
     self.first_data_timeout = 30  # 30 seconds timeout for first data
-    self.last_line_time = None  # Timestamp of last received line
+    self.last_line_time = None  # Timestamp of last received line (event loop clock)
     self.boot_verify_sent = False  # Track if uname -a sent
     self.boot_verify_enter_sent = False  # Track if Enter sent to wake up shell prompt
     self.boot_verify_kernel_seen = False  # Track if kernel boot message seen
     self.prompt_wake_attempts = 0  # Track wake-up attempts when waiting for prompt
     # Board info collection
     self.board_info_uname_received = False  # Track if uname -a output received
-    self.board_info_collection_queue = []  # Queue of commands to execute
-    self.board_info_current_command = None  # Current command being executed
-    self.board_info_output = {}  # Dictionary to store collected information
-    self.board_info_collecting = False  # Flag to track if we're collecting output
-    self.board_info_output_buffer = []  # Buffer for current command output
-    self.board_info_initialized = False  # Track if collection queue initialized
     self.boot_verify_timeout = 120  # 2 minutes to verify boot after burn
     self.no_lines_warning_count = 0  # Count consecutive "no new lines" warnings
     self.burn_complete_time = None  # Timestamp when burn completed
-    self.continuous_enter_task = None  # Task for continuous Enter sending
-    self.stop_enter_sending = False  # Flag to stop Enter sending
+    self.continuous_enter_task = None  # Future of the continuous Enter worker thread
+    self.stop_enter_sending = threading.Event()  # Set to stop Enter sending (wakes the Enter thread)
+    self.serial_write_lock = threading.Lock()  # Serializes every write to the serial port (Enter thread included)
+    self.enter_burst_size = 8  # Enter bytes written per burst by continuous Enter
+    self.enter_burst_interval = 0.008  # Seconds between bursts (~1 Enter per ms on average)
     self.uboot_prompt_seen_after_reboot = False  # Track if U-Boot prompt seen after reboot
+    # Wake-up waits; created in run() so they belong to the running event loop
+    self.first_data_event: Optional[asyncio.Event] = None  # Set on the first serial line
+    self.uboot_prompt_event: Optional[asyncio.Event] = None  # Set when U-Boot prompt is reached
+    self.state_changed_event: Optional[asyncio.Event] = None  # Set on every state transition
     self.boot_verify_enter_task = None  # Task to send Enter after kernel boot
     # U-Boot detection via version command
     self.recent_lines_buffer = []  # Buffer to store last 20 lines for repeated prompt detection
@@ -166,6 +285,16 @@ class BurnTool:
     self.version_response_buffer = []  # Buffer to collect version command response
     self.version_response_timeout = 3.0  # Timeout for version command response (seconds)
     self.version_response_start_time = None  # Timestamp when version command was sent
+    # FSM dispatch: per-state serial line handlers
+    self._state_handlers = {
+      State.INIT: self._handle_init,
+      State.BOOTROM: self._handle_bootrom,
+      State.UBOOT: self._handle_uboot,
+      State.DOWNLOAD: self._handle_download,
+      State.BOOT_VERIFY: self._handle_boot_verify,
+      State.LINUX: self._handle_linux,
+      State.LOGIN: self._handle_login,
+    }
 
   def setup_logging(self):
     """Setup logging to script log file"""
@@ -179,9 +308,9 @@ class BurnTool:
       def format(self, record):
         # Get the formatted message
         msg = super().format(record)
-        # Remove ANSI escape sequences: \033[XXm, \x1b[XXm, etc.
-        msg = re.sub(r'\033\[[0-9;]*m', '', msg)
-        msg = re.sub(r'\x1b\[[0-9;]*m', '', msg)
+        # Remove ANSI color codes (\033 and \x1b are the same ESC byte)
+        if "\x1b" in msg:
+          msg = _COLOR_RE.sub("", msg)
         return msg
     
     # Plain formatter for console (keeps colors)
@@ -190,7 +319,8 @@ class BurnTool:
       datefmt="%Y-%m-%d %H:%M:%S"
     )
     
-    # No-color formatter for file
+    # No-color formatter for file; also needed without a TTY, since adnl and
+    # collect_board_info.py output is logged as received
     file_formatter = NoColorFormatter(
       "%(asctime)s.%(msecs)03d [%(levelname)s] %(message)s",
       datefmt="%Y-%m-%d %H:%M:%S"
@@ -207,83 +337,233 @@ class BurnTool:
     console_handler.setFormatter(console_formatter)
     
     # Setup root logger
+    # Handlers run on a QueueListener thread so log calls from the event loop
+    # are only a queue put; file/console I/O never blocks the loop
+    log_queue = queue.Queue(-1)
     root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    self._log_listener = logging.handlers.QueueListener(
+      log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    self._log_listener.start()
     
     self.logger = logging.getLogger(__name__)
 
-  def log_line(self, log_file: Path, line: str):
-    """Log a line with millisecond timestamp"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    with open(log_file, "a", encoding="utf-8") as f:
-      f.write(f"[{timestamp}] {line}\n")
+  def log_line(self, log_file: Path, line: Union[str, bytes]):
+    """Log a line with millisecond timestamp
 
-  def check_serial_port(self) -> tuple[bool, str]:
-    """Check if serial port exists and is available"""
-    if not os.path.exists(self.serial_port):
-      return False, f"Serial port {self.serial_port} does not exist"
+    Raw bytes (e.g. adnl_burn_pkg output) are written as-is, str is encoded as UTF-8.
+    """
+    # Format the date/time part once per second and only add milliseconds per line
+    now = time.time()
+    second = int(now)
+    if second != self._log_ts_second:
+      self._log_ts_second = second
+      self._log_ts_prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second)).encode("ascii")
+    # Keep log files open for the whole session instead of reopening per line;
+    # writes are buffered and flushed by flush_logs_periodically()
+    f = self.log_files.get(log_file)
+    if f is None:
+      f = open(log_file, "ab", buffering=1 << 16)
+      self.log_files[log_file] = f
+    if isinstance(line, str):
+      line = line.encode("utf-8")
+    f.write(b"[%s.%03d] %s\n" % (self._log_ts_prefix, int((now - second) * 1000), line))
+
+  def flush_logs(self):
+    """Flush all open log files to disk"""
+    for f in self.log_files.values():
+      try:
+        f.flush()
+      except Exception as e:
+        self.logger.debug(f"Error flushing log file: {e}")
+
+  async def flush_logs_periodically(self):
+    """Flush buffered log lines every log_flush_interval seconds"""
+    while True:
+      await asyncio.sleep(self.log_flush_interval)
+      self.flush_logs()
+
+  def close(self):
+    """Flush and close all open log files and stop the log listener"""
+    self.flush_logs()
+    for f in self.log_files.values():
+      try:
+        f.close()
+      except Exception as e:
+        self.logger.debug(f"Error closing log file: {e}")
+    self.log_files = {}
+    if self._relay_http is not None:
+      self._relay_http.close()
+      self._relay_http = None
+    if self._log_listener:
+      # Processes all queued records before returning
+      self._log_listener.stop()
+      self._log_listener = None
+
+  @staticmethod
+  def _iter_proc_pids():
+    """Yield PIDs (as strings) of all processes listed in /proc, except our own"""
+    own_pid = str(os.getpid())
+    for entry in os.scandir("/proc"):
+      if entry.name.isdigit() and entry.name != own_pid:
+        yield entry.name
+
+  def _find_pids_using_port(self) -> list[str]:
+    """Find PIDs of processes that have the serial port open
+
+    Scans /proc/<pid>/fd in-process; falls back to lsof where /proc is not available.
+    """
+    if os.path.isdir("/proc/self/fd"):
+      target = os.path.realpath(self.serial_port)
+      pids = []
+      for pid in self._iter_proc_pids():
+        try:
+          for fd in os.scandir(f"/proc/{pid}/fd"):
+            if os.readlink(fd.path) == target:
+              pids.append(pid)
+              break
+        except OSError:
+          continue  # Process exited or not ours to inspect
+      return pids
 
-    # Check if port is in use
     try:
-      # Try to open in exclusive mode
-      test_ser = serial.Serial(self.serial_port, self.baudrate, timeout=0.1)
-      test_ser.close()
-    except serial.SerialException as e:
-      if "Permission denied" in str(e) or "could not open port" in str(e).lower():
-        # Check for processes using the port
+      result = subprocess.run(
+        ["lsof", self.serial_port],
+        capture_output=True,
+        text=True,
+        timeout=2,
+      )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+      return []
+    pids = []
+    if result.returncode == 0 and result.stdout:
+      processes = result.stdout.strip().split("\n")[1:]  # Skip header
+      for proc in processes:
+        if proc.strip():
+          parts = proc.split()
+          if len(parts) > 1:
+            pids.append(parts[1])
+    return pids
+
+  def _find_terminal_pids(self) -> list[str]:
+    """Find PIDs of minicom/screen processes that may use the serial port
+
+    Matches command lines from /proc in-process; falls back to pgrep where /proc is not available.
+    """
+    pattern = "minicom|screen.*" + os.path.basename(self.serial_port)
+    if os.path.isdir("/proc/self"):
+      regex = re.compile(pattern)
+      pids = []
+      for pid in self._iter_proc_pids():
         try:
-          result = subprocess.run(
-            ["lsof", self.serial_port],
-            capture_output=True,
-            text=True,
-            timeout=2,
-          )
-          if result.returncode == 0 and result.stdout:
-            processes = result.stdout.strip().split("\n")[1:]  # Skip header
-            proc_info = []
-            for proc in processes:
-              if proc.strip():
-                parts = proc.split()
-                if len(parts) > 1:
-                  proc_info.append(f"PID {parts[1]}")
-            if proc_info:
-              return (
-                False,
-                f"{self.serial_port} is in use by: {', '.join(proc_info)}. Please close other processes (minicom, screen, etc.)",
-              )
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-          pass
-        return False, f"{self.serial_port} is in use or permission denied: {e}"
-      return False, f"Cannot open {self.serial_port}: {e}"
+          with open(f"/proc/{pid}/cmdline", "rb") as f:
+            cmdline = f.read().replace(b"\0", b" ").decode("utf-8", errors="replace")
+        except OSError:
+          continue  # Process exited
+        if regex.search(cmdline):
+          pids.append(pid)
+      return pids
 
-    # Check for minicom/screen processes
     try:
       result = subprocess.run(
-        ["pgrep", "-f", "minicom|screen.*" + os.path.basename(self.serial_port)],
+        ["pgrep", "-f", pattern],
         capture_output=True,
         text=True,
         timeout=2,
       )
-      if result.returncode == 0 and result.stdout.strip():
-        pids = result.stdout.strip().split("\n")
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+      return []
+    if result.returncode == 0 and result.stdout.strip():
+      return result.stdout.strip().split("\n")
+    return []
+
+  def precheck(self) -> tuple[bool, str]:
+    """Cheap synchronous checks, run before the event loop is created"""
+    try:
+      os.stat(self.serial_port)
+    except OSError:
+      return False, f"Serial port {self.serial_port} does not exist"
+    if self.relay_ip and not _RELAY_HOST_RE.fullmatch(self.relay_ip):
+      return False, f"Invalid relay address {self.relay_ip!r}: expected an IP address or host name (e.g. 192.168.1.220)"
+    return True, ""
+
+  def check_serial_port(self) -> tuple[bool, str]:
+    """Check if serial port exists and is available"""
+    try:
+      os.stat(self.serial_port)
+    except OSError:
+      return False, f"Serial port {self.serial_port} does not exist"
+
+    def in_use(error) -> tuple[bool, str]:
+      # Check for processes using the port
+      proc_info = [f"PID {pid}" for pid in self._find_pids_using_port()]
+      if proc_info:
         return (
           False,
-          f"Found minicom/screen processes using serial port: PIDs {', '.join(pids)}. Please close them first.",
+          f"{self.serial_port} is in use by: {', '.join(proc_info)}. Please close other processes (minicom, screen, etc.)",
         )
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-      pass
+      return False, f"{self.serial_port} is in use or permission denied: {error}"
+
+    # Check if port is in use
+    if fcntl is not None:
+      # Bare fd + non-blocking exclusive flock (what pyserial's exclusive
+      # mode uses) instead of a full pyserial open with termios setup
+      try:
+        fd = os.open(self.serial_port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+      except PermissionError as e:
+        return in_use(e)
+      except OSError as e:
+        if e.errno == errno.EBUSY:  # Held open in exclusive mode (TIOCEXCL) by another program
+          return in_use(e)
+        return False, f"Cannot open {self.serial_port}: {e}"
+      try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        fcntl.flock(fd, fcntl.LOCK_UN)
+      except BlockingIOError as e:
+        return in_use(e)
+      except OSError:
+        pass  # flock not supported on this device; the open succeeded
+      finally:
+        os.close(fd)
+    else:
+      try:
+        test_ser = serial.Serial(self.serial_port, self.baudrate, timeout=0.1)
+        test_ser.close()
+      except serial.SerialException as e:
+        if "Permission denied" in str(e) or "could not open port" in str(e).lower():
+          return in_use(e)
+        return False, f"Cannot open {self.serial_port}: {e}"
+
+    # Check for minicom/screen processes
+    pids = self._find_terminal_pids()
+    if pids:
+      return (
+        False,
+        f"Found minicom/screen processes using serial port: PIDs {', '.join(pids)}. Please close them first.",
+      )
 
     return True, "OK"
 
+  def _relay_session(self):
+    """Return the HTTP session for relay calls, so they reuse one keep-alive connection"""
+    if self._relay_http is None:
+      requests = _get_requests()
+      session = requests.Session()
+      adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1)
+      session.mount("http://", adapter)
+      self._relay_http = session
+    return self._relay_http
+
   def check_relay(self) -> tuple[bool, str, Optional[str]]:
     """Check relay status and return (success, message, current_status)"""
     if not self.relay_ip:
       return True, "No relay configured", None
 
+    requests = _get_requests()
     try:
       url = f"http://{self.relay_ip}/cm?cmnd=Power"
-      response = requests.get(url, timeout=5)
+      response = self._relay_session().get(url, timeout=5)
       response.raise_for_status()
       data = response.json()
       status = data.get("POWER", "UNKNOWN")
@@ -295,9 +575,10 @@ class BurnTool:
     """Turn relay power OFF"""
     if not self.relay_ip:
       return False
+    requests = _get_requests()
     try:
       url = f"http://{self.relay_ip}/cm?cmnd=Power%20OFF"
-      response = requests.get(url, timeout=5)
+      response = self._relay_session().get(url, timeout=5)
       response.raise_for_status()
       self.logger.info(f"Relay power OFF sent to {self.relay_ip}")
       return True
@@ -309,9 +590,10 @@ class BurnTool:
     """Turn relay power ON"""
     if not self.relay_ip:
       return False
+    requests = _get_requests()
     try:
       url = f"http://{self.relay_ip}/cm?cmnd=Power%20ON"
-      response = requests.get(url, timeout=5)
+      response = self._relay_session().get(url, timeout=5)
       response.raise_for_status()
       self.logger.info(f"Relay power ON sent to {self.relay_ip}")
       return True
@@ -319,50 +601,78 @@ class BurnTool:
       self.logger.error(f"Failed to turn relay ON: {e}")
       return False
 
-  def relay_power_cycle(self, off_delay: float = 5.0):
-    """Power cycle via relay: OFF -> wait (with countdown) -> ON (no wait)"""
+  async def relay_power_cycle(self, off_delay: float = 5.0):
+    """Power cycle via relay: OFF -> wait (with countdown) -> ON (no wait)
+
+    The HTTP calls run in the default executor and the countdown awaits,
+    so the serial reader keeps draining the port throughout.
+    """
     if not self.relay_ip:
       self.logger.warning("No relay configured, skipping power cycle")
       return
 
+    loop = asyncio.get_running_loop()
     self.logger.info("Power cycling board via relay...")
-    self.relay_power_off()
+    await loop.run_in_executor(None, self.relay_power_off)
     
     # Wait for capacitors to discharge (minimum 5 seconds)
     # Show countdown to user
     self.logger.info(f"Waiting {off_delay:.0f} seconds for capacitors to discharge...")
     for remaining in range(int(off_delay), 0, -1):
       self.logger.info(f"  {remaining}...")
-      time.sleep(1.0)
+      await asyncio.sleep(1.0)
     
-    self.relay_power_on()
+    await loop.run_in_executor(None, self.relay_power_on)
     self.logger.info("Power ON sent, starting Enter sending immediately...")
 
-  def send_serial_command(self, command: str, delay: float = 0.002):
-    """Send command character by character with delay"""
+  def send_serial_command(self, command: str, char_delay: float = 0):
+    """Send Ctrl+C, command and carriage return
+
+    Written in one call by default; with char_delay > 0 the command is sent
+    character by character with that delay, for consoles that drop input.
+    """
     if not self.serial_conn or not self.serial_conn.is_open:
       return
 
-    # Send Ctrl+C first to clear any running command
-    self.serial_conn.write(b"\x03")
-    time.sleep(delay)
-
-    # Send command character by character
-    for char in command:
-      self.serial_conn.write(char.encode())
-      time.sleep(delay)
-
-    # Send carriage return
-    self.serial_conn.write(b"\r")
+    # Hold the write lock so continuous Enter can't interleave with the command
+    with self.serial_write_lock:
+      if char_delay > 0:
+        # Send Ctrl+C first to clear any running command
+        self.serial_conn.write(b"\x03")
+        time.sleep(char_delay)
+        for char in command:
+          self.serial_conn.write(char.encode())
+          time.sleep(char_delay)
+        self.serial_conn.write(b"\r")
+      else:
+        self.serial_conn.write(b"\x03" + command.encode() + b"\r")
     self.logger.debug(f"Sent command: {command}")
   
+  def _write_serial(self, data: bytes):
+    """Write data to the serial port, serialized with the other writers"""
+    with self.serial_write_lock:
+      self.serial_conn.write(data)
+
+  def _serial_fd(self) -> Optional[int]:
+    """Raw fd of the serial port for direct os.write(), or None without one (e.g. Windows)"""
+    try:
+      return self.serial_conn.fileno()
+    except (AttributeError, OSError):
+      return None
+
+  def _write_serial_raw(self, fd: Optional[int], data: bytes) -> int:
+    """Write data to fd if there is one, else through pyserial; call with serial_write_lock held"""
+    if fd is None:
+      return self.serial_conn.write(data)
+    return os.write(fd, data)
+
   def send_ctrl_c_enter(self):
     """Send Ctrl+C followed by Enter to wake up board from adnl mode"""
     if not self.serial_conn or not self.serial_conn.is_open:
       return
-    self.serial_conn.write(b"\x03")  # Ctrl+C
+    self._write_serial(b"\x03")  # Ctrl+C
     time.sleep(0.1)
-    self.serial_conn.write(b"\r")  # Enter
+    self._write_serial(b"\r")  # Enter
     time.sleep(0.1)
 
   def send_robust_reboot(self):
@@ -371,77 +681,109 @@ class BurnTool:
       return
     
     # Step 1: Send Ctrl+C to clear any running command
-    self.serial_conn.write(b"\x03")  # Ctrl+C
+    self._write_serial(b"\x03")  # Ctrl+C
     time.sleep(0.2)
     
     # Step 2: Send Enter to get a clean prompt
-    self.serial_conn.write(b"\r")  # Enter
+    self._write_serial(b"\r")  # Enter
     time.sleep(0.2)
     
     # Step 3: Send reset command to clear any state (Linux only, Android will ignore)
-    self.serial_conn.write(b"reset\r")
+    self._write_serial(b"reset\r")
     time.sleep(0.3)
     
     # Step 4: Send reboot -f ; reboot (works on both Linux and Android)
     # Linux: reboot -f works, reboot is ignored (already rebooting)
     # Android: reboot -f fails but ; continues, reboot works
-    self.send_serial_command("reboot -f ; reboot", delay=0.002)
+    self.send_serial_command("reboot -f ; reboot", char_delay=0.002)
     time.sleep(0.1)
 
-  async def send_continuous_enter(self, timeout: float = 10.0):
-    """Send Enter continuously (every 1ms) to catch autoboot
-    
+  def start_continuous_enter(self, timeout: float = 10.0) -> asyncio.Future:
+    """Start send_continuous_enter in a worker thread, return its future"""
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(None, self.send_continuous_enter, timeout, loop)
+
+  def send_continuous_enter(self, timeout: float, loop: asyncio.AbstractEventLoop):
+    """Send Enter continuously (~1 per ms, in bursts) to catch autoboot
+
+    Runs in a worker thread (see start_continuous_enter) so the interval
+    is not limited by event loop scheduling and does not starve the loop.
+    Enters are written enter_burst_size at a time every enter_burst_interval,
+    the same rate as one per ms with a fraction of the write calls.
+
     Args:
       timeout: Maximum time to send Enter (default: 10 seconds)
                If timeout is reached and prompt is not detected, raises error
+      loop: Event loop to report the timeout error on
     """
-    self.logger.info(f"Starting continuous Enter sending (1ms interval, timeout: {timeout}s)")
+    burst = b"\r" * self.enter_burst_size
+    interval = self.enter_burst_interval
+    self.logger.info(
+      f"Starting continuous Enter sending ({len(burst)} every {interval * 1000:.0f}ms, timeout: {timeout}s)"
+    )
     enter_count = 0
-    start_time = time.time()
+    next_log_count = 100  # Log every 100 Enter
+    start_time = time.monotonic()
     
-    # Send first Enter immediately (before async sleep) to catch autoboot as fast as possible
+    # Bursts go straight to the raw fd, bypassing pyserial's write wrapper
+    fd = self._serial_fd() if self.serial_conn else None
+    
+    # Send first Enter immediately to catch autoboot as fast as possible
     if self.serial_conn and self.serial_conn.is_open:
       try:
-        self.serial_conn.write(b"\r")
+        self._write_serial(b"\r")
         enter_count += 1
       except Exception as e:
         self.logger.error(f"Error sending first Enter: {e}")
         return
     
-    while not self.stop_enter_sending and self.serial_conn and self.serial_conn.is_open:
+    while not self.stop_enter_sending.is_set() and self.serial_conn and self.serial_conn.is_open:
       try:
         # Check timeout
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         if elapsed >= timeout:
           # Timeout reached - check if prompt was detected
-          if not self.stop_enter_sending:
+          if not self.stop_enter_sending.is_set():
             # Prompt was not detected, this is an error
             self.logger.error(
               f"Timeout ({timeout}s) reached while sending continuous Enter. "
               f"U-Boot prompt was not detected. Total Enter commands sent: {enter_count}"
             )
-            # Stop sending and raise error
-            self.stop_enter_sending = True
-            self.change_state(State.ERROR, f"Failed to detect U-Boot prompt after {timeout}s of continuous Enter sending")
+            # Stop sending and raise error (FSM state is owned by the event loop)
+            self.stop_enter_sending.set()
+            loop.call_soon_threadsafe(
+              self.change_state,
+              State.ERROR,
+              f"Failed to detect U-Boot prompt after {timeout}s of continuous Enter sending",
+            )
             return
           else:
             # Prompt was detected, just exit normally
             break
         
-        await asyncio.sleep(0.001)  # 1ms = 0.001 seconds
-        if self.stop_enter_sending:
+        # Sleeps between bursts but returns as soon as sending is stopped
+        if self.stop_enter_sending.wait(interval):
           break
-        self.serial_conn.write(b"\r")
-        enter_count += 1
-        if enter_count % 100 == 0:  # Log every 100 Enter
-          elapsed = time.time() - start_time
-          self.logger.debug(f"Sent {enter_count} Enter commands (elapsed: {elapsed:.1f}s)")
+        try:
+          with self.serial_write_lock:
+            # run() closes the port under this lock; never write to a closed
+            # (and possibly reused) fd
+            if not self.serial_conn.is_open:
+              break
+            enter_count += self._write_serial_raw(fd, burst)
+        except BlockingIOError:
+          # TX buffer full; drop this burst, the next one follows shortly
+          pass
+        if enter_count >= next_log_count:
+          next_log_count += 100
+          elapsed = time.monotonic() - start_time
+          self.logger.debug("Sent %d Enter commands (elapsed: %.1fs)", enter_count, elapsed)
       except Exception as e:
         self.logger.error(f"Error sending continuous Enter: {e}")
         break
     
-    elapsed = time.time() - start_time
-    if self.stop_enter_sending:
+    elapsed = time.monotonic() - start_time
+    if self.stop_enter_sending.is_set():
       self.logger.info(f"Stopped continuous Enter sending (total: {enter_count} Enter commands, elapsed: {elapsed:.1f}s)")
     else:
       self.logger.warning(f"Continuous Enter sending ended unexpectedly (total: {enter_count} Enter commands, elapsed: {elapsed:.1f}s)")
@@ -449,18 +791,25 @@ class BurnTool:
   def change_state(self, new_state: State, reason: str = ""):
     """Change FSM state and log transition"""
     if self.state != new_state:
-      timestamp = time.time()
-      self.state_history.append((timestamp, self.state, new_state))
-      elapsed = timestamp - self.last_activity if self.last_activity else 0
-      color = self.COLORS["FSM"]
-      reset = self.COLORS["RESET"]
+      now = time.monotonic()
+      self.state_history.append((time.time(), self.state, new_state))
+      elapsed = now - self.last_activity if self.last_activity else 0
+      color = self._colors["FSM"]
+      reset = self._colors["RESET"]
       self.logger.info(
         f"{color}[FSM]{reset} State transition: {self.state.value} -> {new_state.value} "
         f"({reason}) [elapsed: {elapsed:.1f}s, lines: {self.lines_received}]"
       )
       old_state = self.state
       self.state = new_state
-      self.last_activity = timestamp
+      self.last_activity = now
+      if self.state_changed_event:
+        self.state_changed_event.set()
+      if new_state == State.UBOOT and self.uboot_prompt_event:
+        self.uboot_prompt_event.set()
+      elif new_state == State.ERROR:
+        # Get the lines leading up to the failure on disk right away
+        self.flush_logs()
 
       # Reset flags when going back to INIT
       if new_state == State.INIT:
@@ -487,7 +836,7 @@ class BurnTool:
           if self.state == State.UBOOT and not self.adnl_sent:
             self.logger.info("U-Boot state detected, starting adnl_burn_pkg and sending adnl command...")
             # Start adnl_burn_pkg first
-            if self.adnl_process is None:
+            if self.adnl_task is None:
               self.adnl_task = asyncio.create_task(self.run_adnl_burn_pkg())
               await asyncio.sleep(0.5)  # Allow process to start
             # Send adnl command
@@ -501,10 +850,18 @@ class BurnTool:
 
   def match_pattern(self, line: str) -> Optional[str]:
     """Match line against known patterns, return pattern name"""
-    for pattern_name, pattern in self.PATTERNS.items():
-      if pattern.search(line):
-        return pattern_name
-    return None
+    if not self.TRIGGER_PATTERN.search(line):
+      return None
+    match = self.COMBINED_PATTERN.search(line)
+    if not match:
+      return None
+    # PATTERNS order is the priority: a pattern listed before the one the
+    # alternation hit wins if it matches anywhere in the line
+    hit = match.lastgroup
+    for name, pattern in self.PATTERNS.items():
+      if name == hit or pattern.search(line):
+        return name
+    return hit
   
   def _check_repeated_prompt(self, line: str) -> bool:
     """Check if the same prompt appears 20 times in recent lines"""
@@ -536,10 +893,16 @@ class BurnTool:
       return True
     
     # Debug: log when buffer is full but lines differ
-    if len(self.recent_lines_buffer) == self.recent_lines_buffer_size:
+    if (
+      len(self.recent_lines_buffer) == self.recent_lines_buffer_size
+      and self.logger.isEnabledFor(logging.DEBUG)
+    ):
       unique_lines = set(self.recent_lines_buffer)
       if len(unique_lines) <= 3:  # Only a few unique lines
-        self.logger.debug(f"Buffer full but not all same: {len(unique_lines)} unique lines. First: '{first_line}', Last: '{self.recent_lines_buffer[-1]}'")
+        self.logger.debug(
+          "Buffer full but not all same: %d unique lines. First: '%s', Last: '%s'",
+          len(unique_lines), first_line, self.recent_lines_buffer[-1],
+        )
     
     return False
   
@@ -551,7 +914,7 @@ class BurnTool:
     self.logger.info("Repeated prompt detected (20x), sending 'version' command to detect U-Boot...")
     self.send_serial_command("version")
     self.version_command_sent = True
-    self.version_response_start_time = time.time()
+    self.version_response_start_time = time.monotonic()
     self.version_response_buffer = []
   
   def _check_version_response(self, line: str) -> bool:
@@ -564,7 +927,7 @@ class BurnTool:
     
     # Check timeout
     if self.version_response_start_time:
-      elapsed = time.time() - self.version_response_start_time
+      elapsed = time.monotonic() - self.version_response_start_time
       if elapsed > self.version_response_timeout:
         # Timeout - check collected response
         response_text = " ".join(self.version_response_buffer)
@@ -591,6 +954,43 @@ class BurnTool:
     
     return False
 
+  def _read_serial_blocking(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+    """Blocking serial reader, runs in a dedicated thread and feeds queue"""
+    while not self.serial_reader_stop.is_set() and self.serial_conn and self.serial_conn.is_open:
+      try:
+        # Blocks (no port timeout) until the first byte arrives or
+        # cancel_read() is called, then drains everything else already
+        # buffered in one call
+        data = self.serial_conn.read(self.serial_conn.in_waiting or 1)
+      except Exception as e:
+        if self.serial_reader_stop.is_set() or not self.serial_conn.is_open:
+          break
+        self.logger.error(f"Error reading serial: {e}")
+        time.sleep(0.1)
+        continue
+      if data:
+        try:
+          loop.call_soon_threadsafe(queue.put_nowait, data)
+        except RuntimeError:
+          break  # Event loop closed
+
+  def _on_serial_readable(self, fd: int, queue: asyncio.Queue):
+    """Event loop reader callback: move whatever the port has into queue"""
+    try:
+      data = os.read(fd, 65536)
+    except BlockingIOError:
+      return
+    except OSError as e:
+      self.logger.error(f"Error reading serial: {e}")
+      data = b""
+    if data:
+      queue.put_nowait(data)
+      return
+    # Readable but no data (device gone) or a read error: stop watching
+    # the fd instead of spinning on it
+    self.logger.error("Serial port stopped delivering data, reader detached")
+    asyncio.get_running_loop().remove_reader(fd)
+
   async def read_serial_async(self):
     """Async serial port reader"""
     if not self.serial_conn:
@@ -599,99 +999,149 @@ class BurnTool:
 
     self.logger.info("Serial reader task started")
     self.serial_reader_started = True
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    self.serial_reader_stop.clear()
+    # On POSIX the (non-blocking) port fd is watched by the event loop's
+    # selector directly; elsewhere (no fileno()/add_reader, e.g. Windows)
+    # blocking reads happen in a separate thread
+    fd = None
+    try:
+      fd = self.serial_conn.fileno()
+      loop.add_reader(fd, self._on_serial_readable, fd, queue)
+    except (AttributeError, NotImplementedError, OSError):
+      fd = None
+      reader_thread = threading.Thread(
+        target=self._read_serial_blocking,
+        args=(loop, queue),
+        name="serial-reader",
+        daemon=True,
+      )
+      reader_thread.start()
+
+    try:
+      await self._process_serial_queue(queue)
+    finally:
+      self.serial_reader_stop.set()
+      if fd is not None:
+        loop.remove_reader(fd)
+      elif self.serial_conn.is_open:
+        # Wake the reader thread out of its blocking read
+        self.serial_conn.cancel_read()
+
+    self.logger.info("Serial reader task ended")
+
+  async def _process_serial_queue(self, queue: asyncio.Queue):
+    """Split data from the serial reader thread into lines and process them"""
+    # All timestamps here use the event loop's monotonic clock, sampled once per iteration
+    loop = asyncio.get_running_loop()
     buffer = b""
-    last_data_time = time.time()
+    last_data_time = loop.time()
     first_data_received = False
-    serial_start_time = time.time()
-    last_buffer_process_time = time.time()
+    serial_start_time = last_data_time
+    last_buffer_process_time = last_data_time
     buffer_process_interval = 0.5  # Process buffer every 0.5 seconds even without newline
+    # Per-line lookups hoisted out of the loop
+    is_enabled_for = self.logger.isEnabledFor
+    log_line = self.log_line
+    serial_log = self.serial_log
+    log_info = self.logger.info
+    line_fmt = self._serial_line_fmt
+    first_data_event = self.first_data_event
+    process_serial_line = self.process_serial_line
 
     while self.serial_conn.is_open:
       try:
-        # Read available data
-        if self.serial_conn.in_waiting > 0:
-          data = self.serial_conn.read(self.serial_conn.in_waiting)
+        # Wait for data, waking up at least every buffer_process_interval
+        # to handle prompts without newline and the first data timeout
+        try:
+          data = await asyncio.wait_for(queue.get(), timeout=buffer_process_interval)
+        except asyncio.TimeoutError:
+          data = b""
+        if data and not queue.empty():
+          # Coalesce everything queued meanwhile so it is framed in one pass
+          chunks = [data]
+          while not queue.empty():
+            chunks.append(queue.get_nowait())
+          data = b"".join(chunks)
+        now = loop.time()
+        if data:
           buffer += data
-          current_time = time.time()
           
           if not first_data_received:
             first_data_received = True
-            elapsed = current_time - serial_start_time
+            elapsed = now - serial_start_time
             self.logger.info(
               f"First serial data received after {elapsed:.1f} seconds "
               f"({len(data)} bytes)"
             )
 
-          last_data_time = current_time
-          self.logger.debug(f"Read {len(data)} bytes from serial port")
-
-          # Process complete lines
-          while b"\n" in buffer:
-            line_bytes, buffer = buffer.split(b"\n", 1)
+          last_data_time = now
+          if is_enabled_for(logging.DEBUG):
+            self.logger.debug("Read %d bytes from serial port", len(data))
+
+          # Process complete lines: split once, keep the unterminated tail
+          lines = buffer.split(b"\n")
+          buffer = lines.pop()
+          for line_bytes in lines:
+            # Blank (CR/whitespace-only) lines are dropped before decoding
+            line_bytes = line_bytes.strip()
+            if not line_bytes:
+              continue
             try:
               line = line_bytes.decode("utf-8", errors="replace").strip()
               if line:
-                # Remove all ANSI escape codes (colors, cursor positions, queries, etc.)
-                # This includes: \x1b[31m, \x1b[2;3H, \x1b[?25h, \x1b[230;1R, etc.
-                line = re.sub(r"\x1b\[[0-9;?]*[a-zA-Z]", "", line)
-                # Also remove standalone escape sequences like ;230R (cursor position responses)
-                line = re.sub(r";\d+R", "", line)
-                # Remove any remaining control characters
-                line = re.sub(r"[\x00-\x1f\x7f-\x9f]", "", line)
-                self.log_line(self.serial_log, line)
+                # Remove all ANSI escape codes and control characters
+                line = _strip_ansi(line)
+                log_line(serial_log, line)
                 self.lines_received += 1
+                first_data_event.set()
                 
                 # Log all lines at INFO level so user can see what's happening
-                self.last_line_time = time.time()
+                self.last_line_time = now
                 # Reset warning counter when new line is received
                 self.no_lines_warning_count = 0
-                color = self.COLORS["SERIAL"]
-                reset = self.COLORS["RESET"]
-                self.logger.info(f"{color}[Serial #{self.lines_received}]{reset} {line}")
+                log_info(line_fmt, self.lines_received, line)
                 
-                await self.process_serial_line(line)
+                await process_serial_line(line)
             except Exception as e:
               self.logger.error(f"Error processing line: {e}")
 
         # Process buffer even without newline if enough time has passed
         # This handles cases where prompt comes without newline
-        current_time = time.time()
         if (
           buffer
-          and current_time - last_buffer_process_time > buffer_process_interval
+          and now - last_buffer_process_time > buffer_process_interval
         ):
+          # Take the pending bytes and always clear the buffer, so bytes that
+          # don't form a line (e.g. only CR/whitespace) are not re-decoded on
+          # every interval and can't accumulate
+          pending = buffer.strip()
+          buffer = b""
           try:
             # Try to decode buffer as a line (even without newline)
-            line = buffer.decode("utf-8", errors="replace").strip()
+            line = pending.decode("utf-8", errors="replace").strip() if pending else ""
             if line:
-              # Remove all ANSI escape codes (colors, cursor positions, queries, etc.)
-              # This includes: \x1b[31m, \x1b[2;3H, \x1b[?25h, \x1b[230;1R, etc.
-              line = re.sub(r"\x1b\[[0-9;?]*[a-zA-Z]", "", line)
-              # Also remove standalone escape sequences like ;230R (cursor position responses)
-              line = re.sub(r";\d+R", "", line)
-              # Remove any remaining control characters
-              line = re.sub(r"[\x00-\x1f\x7f-\x9f]", "", line)
-              self.log_line(self.serial_log, line)
+              # Remove all ANSI escape codes and control characters
+              line = _strip_ansi(line)
+              log_line(serial_log, line)
               self.lines_received += 1
+              first_data_event.set()
               
-              self.last_line_time = time.time()
+              self.last_line_time = now
               # Reset warning counter when new line is received
               self.no_lines_warning_count = 0
-              color = self.COLORS["SERIAL"]
-              reset = self.COLORS["RESET"]
-              self.logger.info(f"{color}[Serial #{self.lines_received}]{reset} {line}")
+              log_info(line_fmt, self.lines_received, line)
               
-              await self.process_serial_line(line)
-              # Clear buffer after processing
-              buffer = b""
+              await process_serial_line(line)
           except Exception as e:
             self.logger.debug(f"Error processing buffer without newline: {e}")
           
-          last_buffer_process_time = current_time
+          last_buffer_process_time = now
 
         # Check for first data timeout (only if no data received yet)
         if not first_data_received:
-          elapsed_no_data = time.time() - serial_start_time
+          elapsed_no_data = now - serial_start_time
           if elapsed_no_data > self.first_data_timeout:
             self.logger.error(
               f"No serial data received for {elapsed_no_data:.1f} seconds. "
@@ -700,17 +1150,13 @@ class BurnTool:
             self.change_state(State.ERROR, "No serial data received")
             break
 
-        await asyncio.sleep(0.01)  # Small delay to prevent CPU spinning
-
       except Exception as e:
         self.logger.error(f"Error reading serial: {e}")
         await asyncio.sleep(0.1)
 
-    self.logger.info("Serial reader task ended")
-
   async def process_serial_line(self, line: str):
     """Process a line from serial port and update FSM"""
-    self.last_activity = time.time()
+    self.last_activity = time.monotonic()
     
     # Reset wake-up attempts counter when we receive any data
     self.prompt_wake_attempts = 0
@@ -734,7 +1180,7 @@ class BurnTool:
             # CRITICAL: Stop continuous Enter sending before sending adnl command
             # Otherwise Enter characters will interfere with adnl command
             if self.continuous_enter_task and not self.continuous_enter_task.done():
-              self.stop_enter_sending = True
+              self.stop_enter_sending.set()
               self.logger.info("Stopping continuous Enter before sending adnl command...")
               # Wait a bit for the task to stop (max 100ms)
               try:
@@ -745,7 +1191,7 @@ class BurnTool:
             # Transition to DOWNLOAD state
             self.change_state(State.DOWNLOAD, "U-Boot detected via version command, entering download mode")
             # Start adnl_burn_pkg as async task first (for all boards)
-            if self.adnl_process is None:
+            if self.adnl_task is None:
               self.adnl_task = asyncio.create_task(self.run_adnl_burn_pkg())
               await asyncio.sleep(0.5)  # Allow process to start
             # Send adnl command
@@ -755,11 +1201,11 @@ class BurnTool:
     # Pattern matching
     pattern = self.match_pattern(line)
     if pattern:
-      color = self.COLORS["PATTERN"]
-      reset = self.COLORS["RESET"]
+      color = self._colors["PATTERN"]
+      reset = self._colors["RESET"]
       self.logger.info(f"{color}[Pattern]{reset} Matched '{pattern}' in: {line[:100]}")
       # If pattern matched, clear recent lines buffer (we're making progress)
-      if pattern in ["uboot_prompt", "shell_prompt", "login_prompt"]:
+      if pattern in self.PROMPT_PATTERNS:
         self.recent_lines_buffer = []
         self.version_command_sent = False
         self.version_response_buffer = []
@@ -767,7 +1213,7 @@ class BurnTool:
 
     # Check for repeated prompt in INIT or UBOOT state (fallback U-Boot detection)
     # This handles cases where we're at a U-Boot prompt but pattern doesn't match
-    if (self.state == State.INIT or self.state == State.UBOOT) and not pattern:
+    if not pattern and self.state in (State.INIT, State.UBOOT):
       # No pattern matched, check for repeated prompt
       is_repeated = self._check_repeated_prompt(line)
       if is_repeated:
@@ -780,493 +1226,373 @@ class BurnTool:
         unique_lines = set(self.recent_lines_buffer)
         self.logger.info(f"[DEBUG] State={self.state.value}, Buffer has {len(self.recent_lines_buffer)} lines, {len(unique_lines)} unique. First: '{self.recent_lines_buffer[0] if self.recent_lines_buffer else 'N/A'}', Last: '{self.recent_lines_buffer[-1] if self.recent_lines_buffer else 'N/A'}'")
 
-    # State machine logic
-    if self.state == State.INIT:
-      if pattern == "bootrom" or pattern == "bl2":
-        self.change_state(State.BOOTROM, "BootROM/BL2 detected")
-      elif pattern == "uboot_version":
-        self.change_state(State.UBOOT, "U-Boot detected")
-      elif pattern == "uboot_prompt":
-        # Already at U-Boot prompt
-        self.change_state(State.UBOOT, "U-Boot prompt detected")
-      elif pattern == "login_prompt":
-        # Board is at login prompt - send root to login
-        if not self.login_sent:
-          self.send_serial_command("root")
-          self.logger.info("Sent 'root' for login (no password)")
-          self.login_sent = True
-          self.logger.info("Waiting 5 seconds after login...")
-          await asyncio.sleep(5.0)
-          self.change_state(State.LOGIN, "Login sent")
-      elif pattern == "shell_prompt":
-        # Disable kernel messages first
-        # Use echo to /proc/sys/kernel/printk (works on both Linux and Android with root)
-        self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk 2>/dev/null')
-        self.logger.info("Disabled kernel messages (printk)")
-        await asyncio.sleep(0.2)
-        # Already booted to Linux - send reboot immediately and stay in INIT
-        if not self.reboot_sent:
-          self.send_robust_reboot()
-          self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f)")
-          self.reboot_sent = True
-          # Reset flags for next cycle
-          self.login_sent = False
-          self.adnl_sent = False
-          self.uboot_prompt_seen_after_reboot = False
-          self.stop_enter_sending = False
-          # Stay in INIT state (rebooting)
-          # Do NOT start continuous Enter here - wait for BL2 stage to be detected
-          # Continuous Enter will start when BL31 stage is detected (see below)
-          self.logger.info("Board rebooting, waiting for BL31 stage to start continuous Enter...")
-      # Handle U-Boot prompt in INIT state (if continuous Enter is running)
-      if pattern == "uboot_prompt":
-        # Stop continuous Enter sending (if running)
-        if self.continuous_enter_task and not self.continuous_enter_task.done():
-          self.stop_enter_sending = True
-          self.logger.info("U-Boot prompt detected in INIT state, stopping continuous Enter sending...")
-          # Wait a bit for the task to stop (max 100ms)
-          try:
-            await asyncio.wait_for(self.continuous_enter_task, timeout=0.1)
-          except (asyncio.TimeoutError, asyncio.CancelledError):
-            pass
-          await asyncio.sleep(0.05)  # Small delay to ensure Enter sending stopped
-        # Transition to UBOOT state to handle adnl command
-        if not self.adnl_sent:
-          self.change_state(State.UBOOT, "U-Boot prompt detected in INIT state")
-      
-      # Start continuous Enter when BL31 stage is detected
-      # This is the PRIMARY way to catch autoboot after reboot
-      # Only if continuous Enter is not already running
-      if self.reboot_sent and pattern == "bl31":
-        if not self.continuous_enter_task or self.continuous_enter_task.done():
-          self.logger.info(
-            f"BL31 stage detected, starting continuous Enter to catch autoboot (15s timeout)"
-          )
-          # Send first Enter IMMEDIATELY (synchronously) before starting async task
-          # This is critical to catch autoboot which has 0 delay
-          if self.serial_conn and self.serial_conn.is_open:
-            try:
-              self.serial_conn.write(b"\r")
-              self.logger.debug("Sent immediate Enter to catch autoboot")
-            except Exception as e:
-              self.logger.error(f"Error sending immediate Enter: {e}")
-          self.stop_enter_sending = False
-          self.uboot_prompt_seen_after_reboot = False
-          self.continuous_enter_task = asyncio.create_task(
-            self.send_continuous_enter(timeout=15.0)
-          )
-        else:
-          # Continuous Enter already running, just log
-          self.logger.debug(f"BL31 stage detected, but continuous Enter already running")
-
-    elif self.state == State.BOOTROM:
-      if pattern == "uboot_version":
-        self.change_state(State.UBOOT, "U-Boot detected")
-      # After reboot, detect BL31 stage and start continuous Enter
-      # Only if continuous Enter is not already running
-      if self.reboot_sent and pattern == "bl31":
-        if not self.continuous_enter_task or self.continuous_enter_task.done():
-          self.logger.info(
-            f"BL31 stage detected, starting continuous Enter to catch autoboot (15s timeout)"
-          )
-          # Send first Enter IMMEDIATELY (synchronously) before starting async task
-          # This is critical to catch autoboot which has 0 delay
-          if self.serial_conn and self.serial_conn.is_open:
-            try:
-              self.serial_conn.write(b"\r")
-              self.logger.debug("Sent immediate Enter to catch autoboot")
-            except Exception as e:
-              self.logger.error(f"Error sending immediate Enter: {e}")
-          self.stop_enter_sending = False
-          self.uboot_prompt_seen_after_reboot = False
-          self.continuous_enter_task = asyncio.create_task(
-            self.send_continuous_enter(timeout=15.0)
-          )
-        else:
-          # Continuous Enter already running, just log
-          self.logger.debug(f"BL31 stage detected, but continuous Enter already running")
-
-    elif self.state == State.UBOOT:
-      if pattern == "autoboot":
-        # Send Enter immediately to stop autoboot
-        self.send_serial_command("")
-        self.logger.info("Sent Enter to stop autoboot")
-      elif pattern == "uboot_prompt":
-        # U-Boot prompt detected
-        # Stop continuous Enter sending (if running)
-        if self.continuous_enter_task and not self.continuous_enter_task.done():
-          self.stop_enter_sending = True
-          self.logger.info("U-Boot prompt detected, stopping continuous Enter sending...")
-          # Wait a bit for the task to stop (max 100ms)
-          try:
-            await asyncio.wait_for(self.continuous_enter_task, timeout=0.1)
-          except (asyncio.TimeoutError, asyncio.CancelledError):
-            pass
-          await asyncio.sleep(0.05)  # Small delay to ensure Enter sending stopped
-        
-        if self.reboot_sent and not self.uboot_prompt_seen_after_reboot:
-          self.uboot_prompt_seen_after_reboot = True
-        
-        if not self.adnl_sent:
-          # We're at U-Boot prompt
-          # CRITICAL: Start adnl_burn_pkg FIRST, then send adnl command (for all boards)
-          # This ensures the burn process is ready before the board enters download mode
-          if self.adnl_process is None:
-            self.adnl_task = asyncio.create_task(self.run_adnl_burn_pkg())
-            await asyncio.sleep(0.5)  # Allow process to start
-          # Now send adnl command
-          self.send_serial_command("adnl")
-          self.logger.info("Sent 'adnl' command to enter download mode")
-          self.adnl_sent = True
-          self.change_state(State.DOWNLOAD, "Entered download mode")
-      elif pattern == "login_prompt":
-        # Booted to Linux, need to login and reboot
-        # Send root login immediately
-        if not self.login_sent:
-          self.send_serial_command("root")
-          self.logger.info("Sent 'root' for login (no password)")
-          self.login_sent = True
-          self.logger.info("Waiting 5 seconds after login...")
-          await asyncio.sleep(5.0)
-          self.change_state(State.LOGIN, "Linux login detected, login sent")
-        else:
-          # Already sent login, just transition to LINUX state
-          self.change_state(State.LINUX, "Linux login detected")
-      elif pattern == "shell_prompt":
-        # Disable kernel messages first
-        # Use echo to /proc/sys/kernel/printk (works on both Linux and Android with root)
-        self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk 2>/dev/null')
-        self.logger.info("Disabled kernel messages (printk)")
-        await asyncio.sleep(0.2)
-        # Board booted to Linux shell (autoboot wasn't caught)
-        # Send reboot immediately to start over
-        if not self.reboot_sent:
-          self.send_robust_reboot()
-          self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f) (from UBOOT state)")
-          self.reboot_sent = True
-          # Reset flags for next cycle
-          self.login_sent = False
-          self.adnl_sent = False
-          self.uboot_prompt_seen_after_reboot = False
-          self.stop_enter_sending = False
-          self.change_state(State.INIT, "Rebooting to start over (autoboot was missed)")
-
-    elif self.state == State.DOWNLOAD:
-      # Wait for adnl_burn_pkg to complete
-      if pattern == "usb_reset":
-        self.logger.info("USB download mode active")
-      elif pattern == "uboot_prompt":
-        # U-Boot prompt detected in DOWNLOAD state (shouldn't happen normally, but handle it)
-        # Stop continuous Enter sending (if running)
-        if self.continuous_enter_task and not self.continuous_enter_task.done():
-          self.stop_enter_sending = True
-          self.logger.info("U-Boot prompt detected in DOWNLOAD state, stopping continuous Enter sending...")
-          # Wait a bit for the task to stop (max 100ms)
-          try:
-            await asyncio.wait_for(self.continuous_enter_task, timeout=0.1)
-          except (asyncio.TimeoutError, asyncio.CancelledError):
-            pass
-          await asyncio.sleep(0.05)  # Small delay to ensure Enter sending stopped
-        # If adnl hasn't been sent yet, send it now
-        if not self.adnl_sent:
-          self.logger.warning("U-Boot prompt detected in DOWNLOAD state but adnl not sent yet, sending now...")
-          # CRITICAL: Start adnl_burn_pkg FIRST, then send adnl command (for all boards)
-          if self.adnl_process is None:
-            self.adnl_task = asyncio.create_task(self.run_adnl_burn_pkg())
-            await asyncio.sleep(0.5)  # Allow process to start
-          # Now send adnl command
-          self.send_serial_command("adnl")
-          self.logger.info("Sent 'adnl' command to enter download mode")
-          self.adnl_sent = True
-      elif pattern == "rebooting":
-        # Board rebooting after burn - this is expected, continue monitoring
-        self.logger.info("Board rebooting after burn, monitoring boot sequence...")
-        # Set flags to catch autoboot after reboot
+    # State machine logic; only BOOT_VERIFY inspects raw line contents,
+    # every other handler acts on a matched pattern alone
+    state = self.state
+    if pattern is None and state is not State.BOOT_VERIFY:
+      return
+    handler = self._state_handlers.get(state)
+    if handler:
+      await handler(line, pattern)
+
+  async def _handle_init(self, line: str, pattern: Optional[str]):
+    """Handle a serial line in INIT state (initial state, waiting for boot)"""
+    if pattern == "bootrom" or pattern == "bl2":
+      self.change_state(State.BOOTROM, "BootROM/BL2 detected")
+    elif pattern == "uboot_version":
+      self.change_state(State.UBOOT, "U-Boot detected")
+    elif pattern == "uboot_prompt":
+      # Already at U-Boot prompt
+      self.change_state(State.UBOOT, "U-Boot prompt detected")
+    elif pattern == "login_prompt":
+      # Board is at login prompt - send root to login
+      if not self.login_sent:
+        self.send_serial_command("root")
+        self.logger.info("Sent 'root' for login (no password)")
+        self.login_sent = True
+        self.logger.info("Waiting 5 seconds after login...")
+        await asyncio.sleep(5.0)
+        self.change_state(State.LOGIN, "Login sent")
+    elif pattern == "shell_prompt":
+      # Disable kernel messages first
+      # Use echo to /proc/sys/kernel/printk (works on both Linux and Android with root)
+      self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk 2>/dev/null')
+      self.logger.info("Disabled kernel messages (printk)")
+      await asyncio.sleep(0.2)
+      # Already booted to Linux - send reboot immediately and stay in INIT
+      if not self.reboot_sent:
+        self.send_robust_reboot()
+        self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f)")
         self.reboot_sent = True
-        self.uboot_prompt_seen_after_reboot = False
-        self.stop_enter_sending = False
+        # Reset flags for next cycle
         self.login_sent = False
         self.adnl_sent = False
+        self.uboot_prompt_seen_after_reboot = False
+        self.stop_enter_sending.clear()
+        # Stay in INIT state (rebooting)
+        # Do NOT start continuous Enter here - wait for BL2 stage to be detected
+        # Continuous Enter will start when BL31 stage is detected (see below)
+        self.logger.info("Board rebooting, waiting for BL31 stage to start continuous Enter...")
+    # Handle U-Boot prompt in INIT state (if continuous Enter is running)
+    if pattern == "uboot_prompt":
+      # Stop continuous Enter sending (if running)
+      if self.continuous_enter_task and not self.continuous_enter_task.done():
+        self.stop_enter_sending.set()
+        self.logger.info("U-Boot prompt detected in INIT state, stopping continuous Enter sending...")
+        # Wait a bit for the task to stop (max 100ms)
+        try:
+          await asyncio.wait_for(self.continuous_enter_task, timeout=0.1)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+          pass
+        await asyncio.sleep(0.05)  # Small delay to ensure Enter sending stopped
+      # Transition to UBOOT state to handle adnl command
+      if not self.adnl_sent:
+        self.change_state(State.UBOOT, "U-Boot prompt detected in INIT state")
+    
+    # Start continuous Enter when BL31 stage is detected
+    # This is the PRIMARY way to catch autoboot after reboot
+    self._maybe_start_continuous_enter(pattern)
+
+  async def _handle_bootrom(self, line: str, pattern: Optional[str]):
+    """Handle a serial line in BOOTROM state (BootROM/BL2 detected)"""
+    if pattern == "uboot_version":
+      self.change_state(State.UBOOT, "U-Boot detected")
+    # After reboot, detect BL31 stage and start continuous Enter
+    self._maybe_start_continuous_enter(pattern)
+
+  def _maybe_start_continuous_enter(self, pattern: Optional[str]):
+    """After reboot, start continuous Enter when BL31 stage is detected
 
-    elif self.state == State.BOOT_VERIFY:
-      # After burn, monitor boot and verify successful boot
-      # IMPORTANT: After burn, we want the board to boot to Linux automatically
-      # We should NOT catch autoboot - let it boot normally to Linux
-      # After reboot, detect bootloader stages but DO NOT send Enter to catch autoboot
-      # Just monitor and wait for Linux to boot
-      if self.reboot_sent and (pattern == "bl2" or pattern == "bl31" or pattern == "bl32"):
+    Only if continuous Enter is not already running.
+    """
+    if self.reboot_sent and pattern == "bl31":
+      if not self.continuous_enter_task or self.continuous_enter_task.done():
         self.logger.info(
-          f"Bootloader stage detected ({pattern}) after burn, waiting for Linux boot (not catching autoboot)"
+          f"BL31 stage detected, starting continuous Enter to catch autoboot (15s timeout)"
         )
-      # After reboot, when U-Boot prompt is detected, just log it and continue waiting for Linux
-      # DO NOT stop autoboot - let it continue to Linux
-      if self.reboot_sent and pattern == "uboot_prompt":
-        self.uboot_prompt_seen_after_reboot = True
-        self.logger.info("U-Boot prompt detected after burn, waiting for autoboot to continue to Linux...")
+        # Send first Enter IMMEDIATELY (synchronously) before starting the Enter thread
+        # This is critical to catch autoboot which has 0 delay
+        if self.serial_conn and self.serial_conn.is_open:
+          try:
+            self._write_serial(b"\r")
+            self.logger.debug("Sent immediate Enter to catch autoboot")
+          except Exception as e:
+            self.logger.error(f"Error sending immediate Enter: {e}")
+        self.stop_enter_sending.clear()
+        self.uboot_prompt_seen_after_reboot = False
+        self.continuous_enter_task = self.start_continuous_enter(timeout=15.0)
+      else:
+        # Continuous Enter already running, just log
+        self.logger.debug(f"BL31 stage detected, but continuous Enter already running")
+
+  async def _handle_uboot(self, line: str, pattern: Optional[str]):
+    """Handle a serial line in UBOOT state (U-Boot detected)"""
+    if pattern == "autoboot":
+      # Send Enter immediately to stop autoboot
+      self.send_serial_command("")
+      self.logger.info("Sent Enter to stop autoboot")
+    elif pattern == "uboot_prompt":
+      # U-Boot prompt detected
+      # Stop continuous Enter sending (if running)
+      if self.continuous_enter_task and not self.continuous_enter_task.done():
+        self.stop_enter_sending.set()
+        self.logger.info("U-Boot prompt detected, stopping continuous Enter sending...")
+        # Wait a bit for the task to stop (max 100ms)
+        try:
+          await asyncio.wait_for(self.continuous_enter_task, timeout=0.1)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+          pass
+        await asyncio.sleep(0.05)  # Small delay to ensure Enter sending stopped
       
-      # Detect kernel boot message - after this, we can send Enter to wake up shell prompt
-      if "Linux version" in line and not self.boot_verify_kernel_seen:
-        self.boot_verify_kernel_seen = True
-        self.logger.info("Kernel boot message detected, will send Enter after 5 seconds to wake up shell prompt")
-        # Start async task to send Enter after delay
-        if not self.boot_verify_enter_task or self.boot_verify_enter_task.done():
-          async def send_enter_after_delay():
-            await asyncio.sleep(5.0)  # Wait 5 seconds for system to fully boot
-            if self.serial_conn and self.serial_conn.is_open and not self.boot_verify_enter_sent and not self.boot_verify_sent:
-              try:
-                self.serial_conn.write(b"\r")
-                self.logger.info("Sent Enter to wake up shell prompt after kernel boot")
-                self.boot_verify_enter_sent = True
-              except Exception as e:
-                self.logger.error(f"Error sending Enter to wake up shell prompt: {e}")
-          self.boot_verify_enter_task = asyncio.create_task(send_enter_after_delay())
+      if self.reboot_sent and not self.uboot_prompt_seen_after_reboot:
+        self.uboot_prompt_seen_after_reboot = True
+        self.uboot_prompt_event.set()
       
-      # Don't send any commands during bootloader stages, just monitor
-      if pattern == "login_prompt" and not self.login_sent:
-        # Login prompt detected, send root
+      if not self.adnl_sent:
+        # We're at U-Boot prompt
+        # CRITICAL: Start adnl_burn_pkg FIRST, then send adnl command (for all boards)
+        # This ensures the burn process is ready before the board enters download mode
+        if self.adnl_task is None:
+          self.adnl_task = asyncio.create_task(self.run_adnl_burn_pkg())
+          await asyncio.sleep(0.5)  # Allow process to start
+        # Now send adnl command
+        self.send_serial_command("adnl")
+        self.logger.info("Sent 'adnl' command to enter download mode")
+        self.adnl_sent = True
+        self.change_state(State.DOWNLOAD, "Entered download mode")
+    elif pattern == "login_prompt":
+      # Booted to Linux, need to login and reboot
+      # Send root login immediately
+      if not self.login_sent:
         self.send_serial_command("root")
         self.logger.info("Sent 'root' for login (no password)")
         self.login_sent = True
         self.logger.info("Waiting 5 seconds after login...")
         await asyncio.sleep(5.0)
-      elif pattern == "shell_prompt" and not self.boot_verify_sent:
-        # Disable kernel messages first
-        self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk')
-        self.logger.info("Disabled kernel messages (printk)")
-        await asyncio.sleep(0.2)
-        # Shell prompt detected (Linux or Android), send uname -a to verify boot
-        self.send_serial_command("uname -a")
-        self.logger.info("Sent 'uname -a' to verify successful boot")
-        self.boot_verify_sent = True
-      
-      # Check if line contains kernel version (from uname -a output only)
-      # Wait for shell prompt, send uname -a, then verify kernel version from response
-      if self.boot_verify_sent and not self.board_info_uname_received and (
-        "Linux" in line
-        and ("#1" in line or "SMP" in line or "PREEMPT" in line or "GNU/Linux" in line)
-      ):
-        # Kernel version detected from uname -a output
-        self.logger.info(f"Kernel version detected from uname -a: {line[:100]}")
-        self.board_info_uname_received = True
-        self.logger.info("Boot verified successfully, calling collect_board_info.py")
-        # Call external collect_board_info.py script
-        self._call_collect_board_info_script()
-        self.change_state(State.COMPLETE, "Boot verified and board information collected")
-
-    elif self.state == State.LINUX:
-      if pattern == "login_prompt" and not self.login_sent:
-        # Send root login
-        self.send_serial_command("root")
-        self.logger.info("Sent 'root' for login")
-        self.login_sent = True
-        self.logger.info("Waiting 5 seconds after login...")
-        await asyncio.sleep(5.0)
-        self.change_state(State.LOGIN, "Login sent")
-      elif pattern == "shell_prompt":
-        # Disable kernel messages first
-        # Use echo to /proc/sys/kernel/printk (works on both Linux and Android with root)
-        self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk 2>/dev/null')
-        self.logger.info("Disabled kernel messages (printk)")
-        await asyncio.sleep(0.2)
-        if not self.reboot_sent:
-          # Logged in, send reboot to go back to U-Boot
-          self.send_robust_reboot()
-          self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f)")
-          self.reboot_sent = True
-          # Reset flags for next cycle
-          self.login_sent = False
-          self.adnl_sent = False
-          self.uboot_prompt_seen_after_reboot = False
-          self.stop_enter_sending = False
-          self.change_state(State.INIT, "Rebooting to start over")
-        else:
-          # Already rebooted, just wait
+        self.change_state(State.LOGIN, "Linux login detected, login sent")
+      else:
+        # Already sent login, just transition to LINUX state
+        self.change_state(State.LINUX, "Linux login detected")
+    elif pattern == "shell_prompt":
+      # Disable kernel messages first
+      # Use echo to /proc/sys/kernel/printk (works on both Linux and Android with root)
+      self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk 2>/dev/null')
+      self.logger.info("Disabled kernel messages (printk)")
+      await asyncio.sleep(0.2)
+      # Board booted to Linux shell (autoboot wasn't caught)
+      # Send reboot immediately to start over
+      if not self.reboot_sent:
+        self.send_robust_reboot()
+        self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f) (from UBOOT state)")
+        self.reboot_sent = True
+        # Reset flags for next cycle
+        self.login_sent = False
+        self.adnl_sent = False
+        self.uboot_prompt_seen_after_reboot = False
+        self.stop_enter_sending.clear()
+        self.change_state(State.INIT, "Rebooting to start over (autoboot was missed)")
+
+  async def _handle_download(self, line: str, pattern: Optional[str]):
+    """Handle a serial line in DOWNLOAD state (adnl download mode)"""
+    # Wait for adnl_burn_pkg to complete
+    if pattern == "usb_reset":
+      self.logger.info("USB download mode active")
+    elif pattern == "uboot_prompt":
+      # U-Boot prompt detected in DOWNLOAD state (shouldn't happen normally, but handle it)
+      # Stop continuous Enter sending (if running)
+      if self.continuous_enter_task and not self.continuous_enter_task.done():
+        self.stop_enter_sending.set()
+        self.logger.info("U-Boot prompt detected in DOWNLOAD state, stopping continuous Enter sending...")
+        # Wait a bit for the task to stop (max 100ms)
+        try:
+          await asyncio.wait_for(self.continuous_enter_task, timeout=0.1)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
           pass
-      # Also check for shell_prompt even if we just transitioned to LINUX
-      # This handles the case where we transitioned from INIT to LINUX in the same line
-      if pattern == "shell_prompt" and not self.reboot_sent:
-        # Disable kernel messages first
-        self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk')
-        self.logger.info("Disabled kernel messages (printk)")
-        await asyncio.sleep(0.2)
-        # Send reboot immediately
+        await asyncio.sleep(0.05)  # Small delay to ensure Enter sending stopped
+      # If adnl hasn't been sent yet, send it now
+      if not self.adnl_sent:
+        self.logger.warning("U-Boot prompt detected in DOWNLOAD state but adnl not sent yet, sending now...")
+        # CRITICAL: Start adnl_burn_pkg FIRST, then send adnl command (for all boards)
+        if self.adnl_task is None:
+          self.adnl_task = asyncio.create_task(self.run_adnl_burn_pkg())
+          await asyncio.sleep(0.5)  # Allow process to start
+        # Now send adnl command
+        self.send_serial_command("adnl")
+        self.logger.info("Sent 'adnl' command to enter download mode")
+        self.adnl_sent = True
+    elif pattern == "rebooting":
+      # Board rebooting after burn - this is expected, continue monitoring
+      self.logger.info("Board rebooting after burn, monitoring boot sequence...")
+      # Set flags to catch autoboot after reboot
+      self.reboot_sent = True
+      self.uboot_prompt_seen_after_reboot = False
+      self.stop_enter_sending.clear()
+      self.login_sent = False
+      self.adnl_sent = False
+
+  async def _handle_boot_verify(self, line: str, pattern: Optional[str]):
+    """Handle a serial line in BOOT_VERIFY state (verifying boot after burn)"""
+    # After burn, monitor boot and verify successful boot
+    # IMPORTANT: After burn, we want the board to boot to Linux automatically
+    # We should NOT catch autoboot - let it boot normally to Linux
+    # After reboot, detect bootloader stages but DO NOT send Enter to catch autoboot
+    # Just monitor and wait for Linux to boot
+    if self.reboot_sent and pattern in self.BOOTLOADER_STAGES:
+      self.logger.info(
+        f"Bootloader stage detected ({pattern}) after burn, waiting for Linux boot (not catching autoboot)"
+      )
+    # After reboot, when U-Boot prompt is detected, just log it and continue waiting for Linux
+    # DO NOT stop autoboot - let it continue to Linux
+    if self.reboot_sent and pattern == "uboot_prompt":
+      self.uboot_prompt_seen_after_reboot = True
+      self.logger.info("U-Boot prompt detected after burn, waiting for autoboot to continue to Linux...")
+    
+    # Detect kernel boot message - after this, we can send Enter to wake up shell prompt
+    if "Linux version" in line and not self.boot_verify_kernel_seen:
+      self.boot_verify_kernel_seen = True
+      self.logger.info("Kernel boot message detected, will send Enter after 5 seconds to wake up shell prompt")
+      # Start async task to send Enter after delay
+      if not self.boot_verify_enter_task or self.boot_verify_enter_task.done():
+        async def send_enter_after_delay():
+          await asyncio.sleep(5.0)  # Wait 5 seconds for system to fully boot
+          if self.serial_conn and self.serial_conn.is_open and not self.boot_verify_enter_sent and not self.boot_verify_sent:
+            try:
+              self._write_serial(b"\r")
+              self.logger.info("Sent Enter to wake up shell prompt after kernel boot")
+              self.boot_verify_enter_sent = True
+            except Exception as e:
+              self.logger.error(f"Error sending Enter to wake up shell prompt: {e}")
+        self.boot_verify_enter_task = asyncio.create_task(send_enter_after_delay())
+    
+    # Don't send any commands during bootloader stages, just monitor
+    if pattern == "login_prompt" and not self.login_sent:
+      # Login prompt detected, send root
+      self.send_serial_command("root")
+      self.logger.info("Sent 'root' for login (no password)")
+      self.login_sent = True
+      self.logger.info("Waiting 5 seconds after login...")
+      await asyncio.sleep(5.0)
+    elif pattern == "shell_prompt" and not self.boot_verify_sent:
+      # Disable kernel messages first
+      self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk')
+      self.logger.info("Disabled kernel messages (printk)")
+      await asyncio.sleep(0.2)
+      # Shell prompt detected (Linux or Android), send uname -a to verify boot
+      self.send_serial_command("uname -a")
+      self.logger.info("Sent 'uname -a' to verify successful boot")
+      self.boot_verify_sent = True
+    
+    # Check if line contains kernel version (from uname -a output only)
+    # Wait for shell prompt, send uname -a, then verify kernel version from response
+    if self.boot_verify_sent and not self.board_info_uname_received and _KERNEL_SIG_RE.search(line):
+      # Kernel version detected from uname -a output
+      self.logger.info(f"Kernel version detected from uname -a: {line[:100]}")
+      self.board_info_uname_received = True
+      self.logger.info("Boot verified successfully, calling collect_board_info.py")
+      # Call external collect_board_info.py script
+      self._call_collect_board_info_script()
+      self.change_state(State.COMPLETE, "Boot verified and board information collected")
+
+  async def _handle_linux(self, line: str, pattern: Optional[str]):
+    """Handle a serial line in LINUX state (Linux booted)"""
+    if pattern == "login_prompt" and not self.login_sent:
+      # Send root login
+      self.send_serial_command("root")
+      self.logger.info("Sent 'root' for login")
+      self.login_sent = True
+      self.logger.info("Waiting 5 seconds after login...")
+      await asyncio.sleep(5.0)
+      self.change_state(State.LOGIN, "Login sent")
+    elif pattern == "shell_prompt":
+      # Disable kernel messages first
+      # Use echo to /proc/sys/kernel/printk (works on both Linux and Android with root)
+      self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk 2>/dev/null')
+      self.logger.info("Disabled kernel messages (printk)")
+      await asyncio.sleep(0.2)
+      if not self.reboot_sent:
+        # Logged in, send reboot to go back to U-Boot
         self.send_robust_reboot()
-        self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f) (immediate)")
+        self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f)")
         self.reboot_sent = True
         # Reset flags for next cycle
         self.login_sent = False
         self.adnl_sent = False
         self.uboot_prompt_seen_after_reboot = False
-        self.stop_enter_sending = False
+        self.stop_enter_sending.clear()
         self.change_state(State.INIT, "Rebooting to start over")
-
-    elif self.state == State.LOGIN:
-      if pattern == "shell_prompt":
-        # Disable kernel messages first
-        self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk')
-        self.logger.info("Disabled kernel messages (printk)")
-        await asyncio.sleep(0.2)
-        if not self.reboot_sent:
-          # Logged in successfully, send reboot
-          self.send_robust_reboot()
-          self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f)")
-          self.reboot_sent = True
-          self.login_sent = False
-          self.adnl_sent = False
-          self.uboot_prompt_seen_after_reboot = False
-          self.stop_enter_sending = False
-          self.change_state(State.INIT, "Rebooting to start over")
-      # Also check for shell_prompt even if we just transitioned to LOGIN
-      # This handles the case where we transitioned from INIT to LOGIN in the same line
-      if pattern == "shell_prompt" and not self.reboot_sent:
-        # Disable kernel messages first
-        self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk')
-        self.logger.info("Disabled kernel messages (printk)")
-        await asyncio.sleep(0.2)
-        # Send reboot immediately
+      else:
+        # Already rebooted, just wait
+        pass
+    # Also check for shell_prompt even if we just transitioned to LINUX
+    # This handles the case where we transitioned from INIT to LINUX in the same line
+    if pattern == "shell_prompt" and not self.reboot_sent:
+      # Disable kernel messages first
+      self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk')
+      self.logger.info("Disabled kernel messages (printk)")
+      await asyncio.sleep(0.2)
+      # Send reboot immediately
+      self.send_robust_reboot()
+      self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f) (immediate)")
+      self.reboot_sent = True
+      # Reset flags for next cycle
+      self.login_sent = False
+      self.adnl_sent = False
+      self.uboot_prompt_seen_after_reboot = False
+      self.stop_enter_sending.clear()
+      self.change_state(State.INIT, "Rebooting to start over")
+
+  async def _handle_login(self, line: str, pattern: Optional[str]):
+    """Handle a serial line in LOGIN state (login sent)"""
+    if pattern == "shell_prompt":
+      # Disable kernel messages first
+      self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk')
+      self.logger.info("Disabled kernel messages (printk)")
+      await asyncio.sleep(0.2)
+      if not self.reboot_sent:
+        # Logged in successfully, send reboot
         self.send_robust_reboot()
-        self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f) (immediate)")
+        self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f)")
         self.reboot_sent = True
         self.login_sent = False
         self.adnl_sent = False
         self.uboot_prompt_seen_after_reboot = False
-        self.stop_enter_sending = False
+        self.stop_enter_sending.clear()
         self.change_state(State.INIT, "Rebooting to start over")
+    # Also check for shell_prompt even if we just transitioned to LOGIN
+    # This handles the case where we transitioned from INIT to LOGIN in the same line
+    if pattern == "shell_prompt" and not self.reboot_sent:
+      # Disable kernel messages first
+      self.send_serial_command('echo "0 0 0 0" > /proc/sys/kernel/printk')
+      self.logger.info("Disabled kernel messages (printk)")
+      await asyncio.sleep(0.2)
+      # Send reboot immediately
+      self.send_robust_reboot()
+      self.logger.info("Sent robust reboot sequence (Ctrl+C, reset, reboot -f) (immediate)")
+      self.reboot_sent = True
+      self.login_sent = False
+      self.adnl_sent = False
+      self.uboot_prompt_seen_after_reboot = False
+      self.stop_enter_sending.clear()
+      self.change_state(State.INIT, "Rebooting to start over")
 
-  def _initialize_board_info_collection(self):
-    """Initialize board info collection queue with all commands"""
-    # Device tree command: try tree first, then find
-    device_tree_cmd = "if command -v tree >/dev/null 2>&1; then tree /proc/device-tree; else find /proc/device-tree -type f 2>/dev/null | while read f; do echo \"=== $f ===\"; cat \"$f\" 2>/dev/null; done; fi"
-    
-    self.board_info_collection_queue = [
-      {"cmd": "hostname", "section": "system", "title": "Hostname"},
-      {"cmd": "lsmod", "section": "kernel", "title": "Loaded Kernel Modules"},
-      {"cmd": "ip a", "section": "network", "title": "Network Interfaces"},
-      {"cmd": "zcat /proc/config.gz 2>/dev/null || echo 'Kernel config not available'", "section": "kernel", "title": "Kernel Configuration"},
-      {"cmd": "cat /etc/version 2>/dev/null || echo 'Not available'", "section": "system", "title": "Version Information"},
-      {"cmd": "cat /etc/os-release 2>/dev/null || echo 'Not available'", "section": "system", "title": "OS Release Information"},
-      {"cmd": "df -h", "section": "storage", "title": "Filesystem Usage"},
-      {"cmd": "mount", "section": "storage", "title": "Mounted Filesystems"},
-      {"cmd": "fdisk -l 2>/dev/null || echo 'fdisk not available'", "section": "storage", "title": "Partition Table"},
-      {"cmd": "cat /proc/cpuinfo", "section": "hardware", "title": "CPU Information"},
-      {"cmd": "cat /proc/meminfo", "section": "hardware", "title": "Memory Information"},
-      {"cmd": device_tree_cmd, "section": "hardware", "title": "Device Tree"},
-      {"cmd": "ls -la /sys/kernel/debug 2>/dev/null | head -n 50", "section": "debug", "title": "Debug Filesystem Contents"},
-      {"cmd": "find /sys/kernel/debug/pinctrl -type f 2>/dev/null | head -n 20", "section": "debug", "title": "Pinctrl Debug Files"},
-      {"cmd": "cat /sys/kernel/debug/pinctrl/*/pinmux-pins 2>/dev/null | head -n 100", "section": "debug", "title": "Pinmux Configuration"},
-    ]
-    self.board_info_output = {}
-    self.board_info_output_buffer = []
-    self.board_info_collecting = False
-    self.board_info_current_command = None
-    self.logger.info(f"Initialized board info collection with {len(self.board_info_collection_queue)} commands")
-
-  def _start_next_board_info_command(self):
-    """Start the next command in the collection queue"""
-    if not self.board_info_collection_queue:
-      return
-    
-    cmd_info = self.board_info_collection_queue.pop(0)
-    self.board_info_current_command = cmd_info
-    self.board_info_output_buffer = []
-    self.board_info_collecting = True
-    
-    self.logger.info(f"Collecting: {cmd_info['title']} ({cmd_info['cmd']})")
-    self.send_serial_command(cmd_info['cmd'])
-
-  def _save_current_command_output(self):
-    """Save collected output for current command"""
-    if not self.board_info_current_command:
-      return
-    
-    cmd_info = self.board_info_current_command
-    section = cmd_info['section']
-    title = cmd_info['title']
-    
-    if section not in self.board_info_output:
-      self.board_info_output[section] = {}
-    
-    self.board_info_output[section][title] = {
-      'command': cmd_info['cmd'],
-      'output': '\n'.join(self.board_info_output_buffer)
-    }
-    
-    self.board_info_collecting = False
-    self.board_info_current_command = None
-    self.board_info_output_buffer = []
-    
-    self.logger.info(f"Saved: {title} ({len(self.board_info_output[section][title]['output'])} chars)")
-
-  def _generate_board_info_markdown(self):
-    """Generate markdown file with collected board information"""
-    sections_order = ['system', 'kernel', 'hardware', 'network', 'storage', 'debug']
-    sections_titles = {
-      'system': 'System Information',
-      'kernel': 'Kernel Information',
-      'hardware': 'Hardware Information',
-      'network': 'Network Information',
-      'storage': 'Storage Information',
-      'debug': 'Debug Information'
-    }
-    
-    md_lines = []
-    md_lines.append("# Board Information")
-    md_lines.append("")
-    # Add hostname if available
-    hostname = self.board_info_output.get('system', {}).get('Hostname', {}).get('output', '').strip()
-    if hostname:
-      md_lines.append(f"**Hostname:** `{hostname}`")
-      md_lines.append("")
-    md_lines.append(f"*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
-    md_lines.append("")
-    
-    # Table of Contents
-    md_lines.append("## Table of Contents")
-    md_lines.append("")
-    for section in sections_order:
-      if section in self.board_info_output:
-        md_lines.append(f"- [{sections_titles[section]}](#{section.replace('_', '-')}-information)")
-        for title in self.board_info_output[section].keys():
-          anchor = title.lower().replace(' ', '-').replace('(', '').replace(')', '')
-          md_lines.append(f"  - [{title}](#{anchor})")
-    md_lines.append("")
-    md_lines.append("---")
-    md_lines.append("")
-    
-    # Content sections
-    for section in sections_order:
-      if section not in self.board_info_output:
-        continue
-      
-      md_lines.append(f"## {sections_titles[section]}")
-      md_lines.append("")
-      
-      for title, data in self.board_info_output[section].items():
-        anchor = title.lower().replace(' ', '-').replace('(', '').replace(')', '')
-        md_lines.append(f"### {title}")
-        md_lines.append("")
-        md_lines.append(f"**Command:** `{data['command']}`")
-        md_lines.append("")
-        md_lines.append("```")
-        md_lines.append(data['output'])
-        md_lines.append("```")
-        md_lines.append("")
-      
-      md_lines.append("---")
-      md_lines.append("")
-    
-    # Write to file
+  @staticmethod
+  def _pump_pipe(fd: int, chunks: queue.Queue):
+    """Blocking-read fd into chunks until EOF, then put b"" (runs in a thread)"""
     try:
-      with open(self.board_info_md, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(md_lines))
-      self.logger.info(f"Board information saved to: {self.board_info_md}")
-    except Exception as e:
-      self.logger.error(f"Failed to write board info markdown: {e}")
+      while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+          break
+        chunks.put(chunk)
+    except OSError:
+      pass
+    finally:
+      chunks.put(b"")
 
   def _call_collect_board_info_script(self):
     """Call external collect_board_info.py script with real-time output"""
-    script_path = Path(__file__).parent / "collect_board_info.py"
-    if not script_path.exists():
+    script_path = os.path.join(_SCRIPT_DIR, "collect_board_info.py")
+    if not os.path.exists(script_path):
       self.logger.warning(f"collect_board_info.py not found at {script_path}, skipping external collection")
       return False
     
@@ -1284,66 +1610,80 @@ class BurnTool:
         ],
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,  # Merge stderr into stdout
-        text=True,
-        bufsize=1,  # Line buffered
+        bufsize=0,  # Raw pipe, read in chunks below
       )
       
-      # Read output line by line in real-time
-      start_time = time.time()
+      # Read output in chunks straight from the pipe fd and log it line by line.
+      # On POSIX the fd is made non-blocking and waited on with a selector
+      # (epoll on Linux), so the timeout is checked even when the script is quiet.
+      fd = process.stdout.fileno()
+      sel = None
+      chunks = None
+      if fcntl is not None:
+        try:
+          fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+          sel = selectors.DefaultSelector()
+          sel.register(fd, selectors.EVENT_READ)
+        except OSError as e:
+          self.logger.debug(f"Cannot poll collect_board_info.py output, using a reader thread: {e}")
+          if sel is not None:
+            sel.close()
+          sel = None
+      if sel is None:
+        # No fcntl on Windows: a daemon thread does the blocking reads
+        chunks = queue.Queue()
+        threading.Thread(
+          target=self._pump_pipe,
+          args=(fd, chunks),
+          name="collect-board-info-reader",
+          daemon=True,
+        ).start()
+      
+      start_time = time.monotonic()
       timeout = 300  # 5 minute timeout
+      pending = b""
       
-      while True:
-        # Check timeout
-        elapsed = time.time() - start_time
-        if elapsed > timeout:
-          process.kill()
-          process.wait()
-          self.logger.warning(f"collect_board_info.py timed out after {timeout} seconds")
-          return False
-        
-        # Check if process is still running
-        return_code = process.poll()
-        if return_code is not None:
-          # Process finished, read any remaining output
-          remaining = process.stdout.read()
-          if remaining:
-            for line in remaining.splitlines():
-              if line.strip():
-                self.logger.info(f"[collect_board_info] {line}")
-          break
-        
-        # Read line (with select for non-blocking check)
-        try:
-          # Use select to check if data is available (non-blocking)
-          import select
-          ready, _, _ = select.select([process.stdout], [], [], 0.1)
-          if ready:
-            # Data available, read line (should not block now)
-            line = process.stdout.readline()
-            if line:
-              line = line.rstrip()
-              if line:
-                # Log in real-time
-                self.logger.info(f"[collect_board_info] {line}")
+      try:
+        while True:
+          # Check timeout
+          elapsed = time.monotonic() - start_time
+          if elapsed > timeout:
+            process.kill()
+            process.wait()
+            self.logger.warning(f"collect_board_info.py timed out after {timeout} seconds")
+            return False
+          
+          if sel is not None:
+            if not sel.select(timeout=1.0):
+              continue
+            try:
+              chunk = os.read(fd, 65536)
+            except BlockingIOError:
+              continue
           else:
-            # No data available, small sleep to avoid busy waiting
-            time.sleep(0.05)
-        except (ImportError, OSError):
-          # select not available on Windows, or other OS error
-          # Fallback: just readline (may block briefly, but bufsize=1 helps)
-          try:
-            line = process.stdout.readline()
+            try:
+              chunk = chunks.get(timeout=1.0)
+            except queue.Empty:
+              continue
+          if not chunk:
+            # EOF: the script closed its output (it has exited)
+            break
+          
+          lines = (pending + chunk).split(b"\n")
+          pending = lines.pop()
+          for raw in lines:
+            line = raw.decode("utf-8", errors="replace").rstrip()
             if line:
-              line = line.rstrip()
-              if line:
-                # Log in real-time
-                self.logger.info(f"[collect_board_info] {line}")
-            else:
-              # EOF or no data, small sleep
-              time.sleep(0.05)
-          except Exception as e:
-            self.logger.debug(f"Error reading from process: {e}")
-            time.sleep(0.1)
+              # Log in real-time
+              self.logger.info("[collect_board_info] %s", line)
+      finally:
+        if sel is not None:
+          sel.close()
+      
+      # Last line without a trailing newline
+      line = pending.decode("utf-8", errors="replace").rstrip()
+      if line:
+        self.logger.info("[collect_board_info] %s", line)
       
       # Wait for process to complete
       return_code = process.wait()
@@ -1369,9 +1709,37 @@ class BurnTool:
       self.logger.warning(f"Failed to call collect_board_info.py: {e}")
       return False
 
+  @staticmethod
+  async def _drain_stream(stream: asyncio.StreamReader, line_queue: asyncio.Queue):
+    """Push lines from stream into line_queue, then None at EOF or on error
+
+    Reads in large chunks and splits lines in memory rather than one
+    readline() per line.
+    """
+    pending = b""
+    try:
+      while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+          break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line_bytes in lines:
+          line_queue.put_nowait(line_bytes)
+      if pending:
+        # Last line without a trailing newline
+        line_queue.put_nowait(pending)
+    finally:
+      line_queue.put_nowait(None)
+
   async def run_adnl_burn_pkg(self):
     """Run adnl_burn_pkg tool and capture output (non-blocking)"""
-    if not self.image_path.exists():
+    # Only one burn per session: never start a second adnl_burn_pkg
+    if self.adnl_process is not None or self.adnl_task not in (None, asyncio.current_task()):
+      self.logger.warning("adnl_burn_pkg already started, not starting it again")
+      return
+
+    if not os.path.exists(self.image_path):
       self.logger.error(f"Image file not found: {self.image_path}")
       self.change_state(State.ERROR, "Image file not found")
       return
@@ -1382,7 +1750,7 @@ class BurnTool:
       # Keep serial port open - burn process also outputs to serial port
       # USB and serial can work simultaneously
       # Run adnl_burn_pkg using async subprocess
-      cmd = ["sudo", "adnl_burn_pkg", "-p", str(self.image_path), "-r", "1"]
+      cmd = ["sudo", "adnl_burn_pkg", "-p", self.image_path, "-r", "1"]
       self.logger.info(f"Executing: {' '.join(cmd)}")
 
       # Use asyncio.create_subprocess_exec for non-blocking I/O
@@ -1392,54 +1760,49 @@ class BurnTool:
         stderr=asyncio.subprocess.STDOUT,
       )
 
-      # Track last progress update time to detect stalls
-      last_progress_time = time.time()
+      # Stall detection: a timer restarted on every progress advance,
+      # instead of comparing timestamps on every line
       last_progress_percent = 0
       progress_stall_timeout = 60  # 60 seconds without progress = stall
 
-      # Read output line by line (async, non-blocking)
+      # Formatted lazily by logging, only if the record is emitted
+      adnl_line_fmt = f"{self._colors['ADNL']}[adnl]{self._colors['RESET']} %s"
+      # Per-line lookups hoisted out of the loop
+      log_line = self.log_line
+      adnl_log = self.adnl_log
+      log_info = self.logger.info
+      log_adnl_lines = self.logger.isEnabledFor(logging.INFO)
+
+      # Read output line by line: a reader task drains stdout into a queue,
+      # so this loop only wakes up when a line (or EOF) arrives
+      line_queue: asyncio.Queue = asyncio.Queue()
+      reader_task = asyncio.create_task(self._drain_stream(self.adnl_process.stdout, line_queue))
       while True:
-        # Use asyncio.wait_for with timeout to allow other tasks to run
-        try:
-          line_bytes = await asyncio.wait_for(
-            self.adnl_process.stdout.readline(),
-            timeout=1.0  # 1 second timeout to allow serial reader to run
-          )
-        except asyncio.TimeoutError:
-          # Timeout is OK - allows serial reader to process data
-          # Check if process is still running
-          if self.adnl_process.returncode is not None:
-            break
-          continue
-
-        if not line_bytes:
+        line_bytes = await line_queue.get()
+        if line_bytes is None:
           break
 
-        line = line_bytes.decode("utf-8", errors="replace").strip()
-        if line:
-          self.log_line(self.adnl_log, line)
-          color = self.COLORS["ADNL"]
-          reset = self.COLORS["RESET"]
-          self.logger.info(f"{color}[adnl]{reset} {line}")
+        line_bytes = line_bytes.strip()
+        if line_bytes:
+          # The log file gets the raw bytes; decode only for the console logger,
+          # and only if it would emit the record
+          log_line(adnl_log, line_bytes)
+          if log_adnl_lines:
+            log_info(adnl_line_fmt, line_bytes.decode("utf-8", errors="replace"))
 
           # Track progress to detect stalls
-          progress_match = re.search(r"%(\d+)\.\.", line)
-          if progress_match:
-            current_percent = int(progress_match.group(1))
-            if current_percent > last_progress_percent:
-              last_progress_percent = current_percent
-              last_progress_time = time.time()
-              self.logger.debug(f"Burn progress: {current_percent}%")
-            elif time.time() - last_progress_time > progress_stall_timeout:
-              self.logger.warning(
-                f"Burn progress stalled at {last_progress_percent}% for "
-                f"{int(time.time() - last_progress_time)} seconds"
-              )
+          current_percent = _find_progress(line_bytes)
+          if current_percent is not None and (
+            current_percent > last_progress_percent or self._progress_stall_handle is None
+          ):
+            last_progress_percent = max(current_percent, last_progress_percent)
+            self._arm_progress_watchdog(last_progress_percent, progress_stall_timeout)
+            self.logger.debug("Burn progress: %d%%", current_percent)
 
           # Check for success
-          if "burn successful" in line.lower() or "burn successful^_^" in line:
+          if _BURN_OK_RE.search(line_bytes):
             self.logger.info("Burn successful! Waiting for board to reboot and boot...")
-            self.burn_complete_time = time.time()
+            self.burn_complete_time = time.monotonic()
             # Reset flags for post-burn boot verification
             self.login_sent = False
             self.boot_verify_sent = False
@@ -1447,12 +1810,19 @@ class BurnTool:
             # Set reboot_sent flag to enable autoboot catching after reboot
             self.reboot_sent = True
             self.uboot_prompt_seen_after_reboot = False
-            self.stop_enter_sending = False
+            self.stop_enter_sending.clear()
             self.change_state(State.BOOT_VERIFY, "Burn completed, verifying boot")
             # Start task to actively wake up shell prompt after reboot
             asyncio.create_task(self._wake_up_shell_after_burn())
             break
 
+      if reader_task.done():
+        # Surface a read error, if any
+        await reader_task
+      else:
+        # Left the loop before EOF (burn successful)
+        reader_task.cancel()
+
       # Wait for process to complete
       return_code = await self.adnl_process.wait()
       if return_code != 0:
@@ -1464,6 +1834,25 @@ class BurnTool:
     except Exception as e:
       self.logger.error(f"Error running adnl_burn_pkg: {e}")
       self.change_state(State.ERROR, f"adnl_burn_pkg error: {e}")
+    finally:
+      if self._progress_stall_handle:
+        self._progress_stall_handle.cancel()
+        self._progress_stall_handle = None
+
+  def _arm_progress_watchdog(self, percent: int, timeout: float):
+    """(Re)start the burn progress stall timer"""
+    if self._progress_stall_handle:
+      self._progress_stall_handle.cancel()
+    self._progress_stall_handle = asyncio.get_running_loop().call_later(
+      timeout, self._warn_progress_stalled, percent, timeout, timeout
+    )
+
+  def _warn_progress_stalled(self, percent: int, stalled_for: float, timeout: float):
+    """Stall timer callback: warn, then re-arm to keep reporting while stalled"""
+    self.logger.warning(f"Burn progress stalled at {percent}% for {int(stalled_for)} seconds")
+    self._progress_stall_handle = asyncio.get_running_loop().call_later(
+      timeout, self._warn_progress_stalled, percent, stalled_for + timeout, timeout
+    )
 
   async def _wake_up_shell_after_burn(self):
     """Wake up shell prompt after burn by sending Enter and handling login if needed"""
@@ -1481,7 +1870,7 @@ class BurnTool:
     # Step 1: Send Enter
     if self.serial_conn and self.serial_conn.is_open:
       try:
-        self.serial_conn.write(b"\r")
+        self._write_serial(b"\r")
         await asyncio.sleep(1.0)  # Wait 1 second for response
         
         # Check if we got login_prompt or shell_prompt (this will be handled by process_serial_line)
@@ -1489,25 +1878,49 @@ class BurnTool:
         
         # Step 2: Send Enter again, if nothing comes, send Ctrl+C then Enter
         self.logger.info("Sending Enter again...")
-        self.serial_conn.write(b"\r")
+        self._write_serial(b"\r")
         await asyncio.sleep(1.0)  # Wait 1 second for response
         
         # If still no response, send Ctrl+C then Enter
         if self.state == State.BOOT_VERIFY and not self.boot_verify_sent:
           self.logger.info("No response, sending Ctrl+C then Enter...")
-          self.serial_conn.write(b"\x03")  # Ctrl+C
+          self._write_serial(b"\x03")  # Ctrl+C
           await asyncio.sleep(0.2)
-          self.serial_conn.write(b"\r")  # Enter
+          self._write_serial(b"\r")  # Enter
           await asyncio.sleep(1.0)  # Wait 1 second for response
           
           # Step 3: If still no shell prompt, try one more Enter
           if self.state == State.BOOT_VERIFY and not self.boot_verify_sent:
             self.logger.info("Sending final Enter...")
-            self.serial_conn.write(b"\r")
+            self._write_serial(b"\r")
             await asyncio.sleep(1.0)
       except Exception as e:
         self.logger.error(f"Error in shell wake-up task: {e}")
 
+  def _log_no_prompt_diagnostic(self):
+    """Log the troubleshooting checklist for a console that never showed a prompt"""
+    self.logger.error("=" * 60)
+    self.logger.error("CRITICAL: No prompt detected after 30 seconds (10s + wake-up + 10s + wake-up + 10s)")
+    self.logger.error("=" * 60)
+    self.logger.error("")
+    self.logger.error("Please check the following:")
+    self.logger.error("")
+    self.logger.error("1. Are you sure the board is accessible via serial UART?")
+    self.logger.error("   - Check serial cable connection")
+    self.logger.error(f"   - Verify serial port path: {self.serial_port}")
+    self.logger.error(f"   - Check baudrate matches board configuration: {self.baudrate}")
+    self.logger.error("")
+    self.logger.error("2. Are you sure the board is powered on?")
+    self.logger.error("   - Check power LED indicators")
+    self.logger.error("   - Verify power supply is connected and working")
+    self.logger.error("")
+    self.logger.error("3. If both above are OK, but still no prompt:")
+    self.logger.error("   - Board might be in an unexpected state")
+    self.logger.error("   - Try manually power cycling the board")
+    self.logger.error("   - Or use relay (--relay <IP>) to power cycle")
+    self.logger.error("")
+    self.logger.error("=" * 60)
+
   async def monitor_timeout(self):
     """Monitor for timeout conditions"""
     self.logger.info("Timeout monitor task started")
@@ -1515,20 +1928,22 @@ class BurnTool:
     last_log_time = 0
     log_interval = 5.0  # Log status every 5 seconds
     prompt_wait_start = None  # Track when we started waiting for a prompt in INIT state
+    loop = asyncio.get_running_loop()
 
     while self.state not in [State.COMPLETE, State.ERROR]:
       await asyncio.sleep(check_interval)
-      elapsed = time.time() - self.last_activity
-      current_time = time.time()
+      now = time.monotonic()
+      elapsed = now - self.last_activity
+      current_time = loop.time()  # Same clock as last_line_time
 
       # Check if we're waiting for a prompt (INIT state with data received but no prompt yet)
       if self.state == State.INIT and self.lines_received > 0:
         # We have data but still in INIT - waiting for a prompt (login, shell, or uboot)
         if prompt_wait_start is None:
-          prompt_wait_start = time.time()
+          prompt_wait_start = now
           self.logger.info("Waiting for prompt (login, shell, or uboot)...")
         
-        wait_elapsed = time.time() - prompt_wait_start
+        wait_elapsed = now - prompt_wait_start
         
         # First 10 seconds: wait for prompt
         if wait_elapsed >= 10.0 and self.prompt_wake_attempts == 0:
@@ -1537,17 +1952,17 @@ class BurnTool:
           if self.serial_conn and self.serial_conn.is_open:
             try:
               # Ctrl+C
-              self.serial_conn.write(b"\x03")
+              self._write_serial(b"\x03")
               await asyncio.sleep(0.2)
               # clear command
-              self.serial_conn.write(b"clear\r")
+              self._write_serial(b"clear\r")
               await asyncio.sleep(0.2)
               # Enter
-              self.serial_conn.write(b"\r")
+              self._write_serial(b"\r")
               await asyncio.sleep(0.2)
               self.logger.info("Wake-up sequence sent")
               self.prompt_wake_attempts = 1
-              prompt_wait_start = time.time()  # Reset timer for next 10 seconds
+              prompt_wait_start = time.monotonic()  # Reset timer for next 10 seconds
             except Exception as e:
               self.logger.error(f"Error sending wake-up sequence: {e}")
         
@@ -1558,43 +1973,23 @@ class BurnTool:
           if self.serial_conn and self.serial_conn.is_open:
             try:
               # Ctrl+C
-              self.serial_conn.write(b"\x03")
+              self._write_serial(b"\x03")
               await asyncio.sleep(0.2)
               # clear command
-              self.serial_conn.write(b"clear\r")
+              self._write_serial(b"clear\r")
               await asyncio.sleep(0.2)
               # Enter
-              self.serial_conn.write(b"\r")
+              self._write_serial(b"\r")
               await asyncio.sleep(0.2)
               self.logger.info("Wake-up sequence sent (2nd attempt)")
               self.prompt_wake_attempts = 2
-              prompt_wait_start = time.time()  # Reset timer for final 10 seconds
+              prompt_wait_start = time.monotonic()  # Reset timer for final 10 seconds
             except Exception as e:
               self.logger.error(f"Error sending wake-up sequence: {e}")
         
         # Final 10 seconds: if still no prompt, error
         elif wait_elapsed >= 10.0 and self.prompt_wake_attempts == 2:
-          self.logger.error("=" * 60)
-          self.logger.error("CRITICAL: No prompt detected after 30 seconds (10s + wake-up + 10s + wake-up + 10s)")
-          self.logger.error("=" * 60)
-          self.logger.error("")
-          self.logger.error("Please check the following:")
-          self.logger.error("")
-          self.logger.error("1. Are you sure the board is accessible via serial UART?")
-          self.logger.error("   - Check serial cable connection")
-          self.logger.error("   - Verify serial port path: " + self.serial_port)
-          self.logger.error("   - Check baudrate matches board configuration: " + str(self.baudrate))
-          self.logger.error("")
-          self.logger.error("2. Are you sure the board is powered on?")
-          self.logger.error("   - Check power LED indicators")
-          self.logger.error("   - Verify power supply is connected and working")
-          self.logger.error("")
-          self.logger.error("3. If both above are OK, but still no prompt:")
-          self.logger.error("   - Board might be in an unexpected state")
-          self.logger.error("   - Try manually power cycling the board")
-          self.logger.error("   - Or use relay (--relay <IP>) to power cycle")
-          self.logger.error("")
-          self.logger.error("=" * 60)
+          self._log_no_prompt_diagnostic()
           self.change_state(State.ERROR, "No prompt detected after 30 seconds with wake-up attempts")
           break
       else:
@@ -1631,6 +2026,15 @@ class BurnTool:
 
     self.logger.info("Timeout monitor task ended")
 
+  @staticmethod
+  async def _wait_event(event: asyncio.Event, timeout: float) -> bool:
+    """Wait until event is set or timeout expires; returns whether it is set"""
+    try:
+      await asyncio.wait_for(event.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+      pass
+    return event.is_set()
+
   async def run(self):
     """Main run loop"""
     self.logger.info("=" * 60)
@@ -1654,12 +2058,20 @@ class BurnTool:
         return False
       self.logger.info(msg)
 
+    self.first_data_event = asyncio.Event()
+    self.uboot_prompt_event = asyncio.Event()
+    self.state_changed_event = asyncio.Event()
+
     # Open serial port
     try:
+      # On POSIX the event loop watches the port fd and reads it with
+      # os.read(), so timeout has no effect there. timeout=None is for the
+      # fallback reader thread (no add_reader, e.g. Windows): its read()
+      # blocks until data arrives and is woken by cancel_read() on shutdown
       self.serial_conn = serial.Serial(
         self.serial_port,
         self.baudrate,
-        timeout=0.1,
+        timeout=None,
         write_timeout=1.0,
       )
       self.logger.info(f"Serial port opened: {self.serial_port}")
@@ -1674,6 +2086,8 @@ class BurnTool:
     
     self.logger.info("Creating timeout monitor task...")
     timeout_task = asyncio.create_task(self.monitor_timeout())
+
+    flush_task = asyncio.create_task(self.flush_logs_periodically())
     
     # Wait a bit for tasks to start
     await asyncio.sleep(0.5)
@@ -1692,35 +2106,40 @@ class BurnTool:
           self.logger.info(f"Retry attempt {attempt}/{max_attempts}...")
         
         # Power cycle: OFF -> wait 5s -> ON (no wait)
-        self.relay_power_cycle()
+        await self.relay_power_cycle()
         
         # Set flags to catch autoboot after power cycle
         self.reboot_sent = True
         self.login_sent = False
         self.adnl_sent = False
         self.uboot_prompt_seen_after_reboot = False
-        self.stop_enter_sending = False
+        self.uboot_prompt_event.clear()
+        self.stop_enter_sending.clear()
         
         # Start continuous Enter immediately after power ON (10 second timeout)
         # This will catch autoboot when BL2 stage is reached
         self.logger.info("Starting continuous Enter to catch autoboot after power cycle (10s timeout)...")
         if not self.continuous_enter_task or self.continuous_enter_task.done():
-          # Send first Enter IMMEDIATELY (synchronously) before starting async task
+          # Send first Enter IMMEDIATELY (synchronously) before starting the Enter thread
           if self.serial_conn and self.serial_conn.is_open:
             try:
-              self.serial_conn.write(b"\r")
+              self._write_serial(b"\r")
               self.logger.debug("Sent immediate Enter to catch autoboot (after power cycle)")
             except Exception as e:
               self.logger.error(f"Error sending immediate Enter: {e}")
-          self.continuous_enter_task = asyncio.create_task(
-            self.send_continuous_enter(timeout=15.0)
-          )
+          self.continuous_enter_task = self.start_continuous_enter(timeout=15.0)
         
         # Wait for U-Boot prompt to be detected (or timeout)
-        # Check every 0.5 seconds
-        start_time = time.time()
+        # Wakes up as soon as the prompt is seen, the state changes or the
+        # continuous Enter worker finishes; no periodic polling
+        start_time = time.monotonic()
         timeout = 12.0  # Slightly longer than continuous Enter timeout to allow for detection
-        while (time.time() - start_time) < timeout:
+        deadline = start_time + timeout
+        while True:
+          remaining = deadline - time.monotonic()
+          if remaining <= 0:
+            break
+          self.state_changed_event.clear()
           # CRITICAL: Check if burn process has started - if so, abort power cycle retry
           if self.state == State.DOWNLOAD and self.adnl_process is not None:
             if self.adnl_process.returncode is None:
@@ -1742,12 +2161,24 @@ class BurnTool:
               self.logger.error("Continuous Enter timeout: U-Boot prompt was not detected after power cycle")
               autoboot_caught = False
               break
-            elif self.stop_enter_sending:
+            elif self.stop_enter_sending.is_set():
               # Task stopped normally (prompt detected)
               autoboot_caught = True
               break
           
-          await asyncio.sleep(0.5)
+          prompt_wait = asyncio.ensure_future(self.uboot_prompt_event.wait())
+          state_wait = asyncio.ensure_future(self.state_changed_event.wait())
+          waiters = {prompt_wait, state_wait}
+          if self.continuous_enter_task and not self.continuous_enter_task.done():
+            waiters.add(self.continuous_enter_task)
+          if self.state == State.DOWNLOAD:
+            # adnl_burn_pkg starting is not an event; recheck for it shortly
+            remaining = min(remaining, 0.5)
+          try:
+            await asyncio.wait(waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+          finally:
+            prompt_wait.cancel()
+            state_wait.cancel()
         
         # Check if we successfully caught autoboot
         if autoboot_caught:
@@ -1760,7 +2191,7 @@ class BurnTool:
               self.logger.warning("Burn process detected, aborting power cycle retry to avoid interrupting burn")
               break  # Exit retry loop, let burn continue
           
-          elapsed = time.time() - start_time
+          elapsed = time.monotonic() - start_time
           self.logger.warning(f"Autoboot not caught after {elapsed:.1f}s (attempt {attempt}/{max_attempts})")
           if attempt < max_attempts:
             self.logger.info("Retrying power cycle...")
@@ -1775,7 +2206,7 @@ class BurnTool:
       # Initial wait and wake-up sequence
       # Board might be in adnl mode, so we need to try different wake-up methods
       self.logger.info("Waiting 3 seconds for initial boot/console wake-up...")
-      await asyncio.sleep(3)
+      await self._wait_event(self.first_data_event, 3.0)
 
       # Check if we received any data
       if self.lines_received == 0:
@@ -1786,28 +2217,40 @@ class BurnTool:
         # First attempt: Send Enter every 0.5s for 10 seconds
         enter_timeout = 10.0
         enter_interval = 0.5
-        start_time = time.time()
+        start_time = time.monotonic()
+        deadline = start_time + enter_timeout
         enter_count = 0
         
         self.logger.info(f"Sending Enter every {enter_interval}s for up to {enter_timeout}s...")
+        # Two CRs per write: one syscall, and a better chance to hit a short console window
+        enter_burst = b"\r\r"
+        fd = self._serial_fd() if self.serial_conn else None
         
-        while (time.time() - start_time) < enter_timeout:
+        while True:
+          # One clock read per iteration, reused for the deadline and the progress log
+          now = time.monotonic()
+          if now >= deadline:
+            break
           if self.serial_conn and self.serial_conn.is_open:
             try:
-              self.serial_conn.write(b"\r")
+              with self.serial_write_lock:
+                self._write_serial_raw(fd, enter_burst)
               enter_count += 1
-              if enter_count % 2 == 0:  # Log every 0.5s
-                elapsed = time.time() - start_time
-                self.logger.info(f"Sending Enter... ({elapsed:.1f}s / {enter_timeout}s)")
+              if enter_count % 2 == 0:  # Log every second
+                self.logger.info(f"Sending Enter... ({now - start_time:.1f}s / {enter_timeout}s)")
+            except BlockingIOError:
+              # TX buffer full (e.g. stuck flow control): drop what is queued, retry on the next interval
+              self.serial_conn.reset_output_buffer()
             except Exception as e:
               self.logger.error(f"Error sending Enter: {e}")
               break
           
-          await asyncio.sleep(enter_interval)
+          # Returns early as soon as the first line arrives
+          await self._wait_event(self.first_data_event, enter_interval)
           
           # Check if we received any data
           if self.lines_received > 0:
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             self.logger.info(f"Received data after {elapsed:.1f}s, console is active")
             break
         
@@ -1817,7 +2260,7 @@ class BurnTool:
           for attempt in range(2):
             self.send_ctrl_c_enter()
             self.logger.info(f"Sent Ctrl+C + Enter (attempt {attempt + 1}/2)")
-            await asyncio.sleep(1.0)
+            await self._wait_event(self.first_data_event, 1.0)
             
             # Check if we received any data
             if self.lines_received > 0:
@@ -1848,9 +2291,14 @@ class BurnTool:
       self.logger.info("Entering main state machine loop...")
       uboot_timeout_start = None
       complete_wait_start = None
+      # Wakes up on every state change; the timeout only bounds how late
+      # the timeout checks below (and flags set outside change_state) are seen
+      recheck_interval = 1.0
+      last_status_log = time.monotonic()
       
       while self.state != State.ERROR:
-        await asyncio.sleep(0.1)
+        await self._wait_event(self.state_changed_event, recheck_interval)
+        self.state_changed_event.clear()
         loop_count += 1
 
         # Check if we're waiting for U-Boot prompt after reboot
@@ -1860,8 +2308,8 @@ class BurnTool:
           and (self.state == State.INIT or self.state == State.BOOTROM)
         ):
           if uboot_timeout_start is None:
-            uboot_timeout_start = time.time()
-          elapsed = time.time() - uboot_timeout_start
+            uboot_timeout_start = time.monotonic()
+          elapsed = time.monotonic() - uboot_timeout_start
           if elapsed > 30:  # 30 seconds timeout
             self.logger.error(
               "Timeout: U-Boot prompt not detected after reboot. "
@@ -1872,25 +2320,30 @@ class BurnTool:
         else:
           uboot_timeout_start = None
 
-        # Log every 50 iterations (5 seconds)
-        if loop_count % 50 == 0:
+        # Log status every 5 seconds
+        if time.monotonic() - last_status_log >= 5.0 and self.logger.isEnabledFor(logging.DEBUG):
+          last_status_log = time.monotonic()
           self.logger.debug(
-            f"Main loop iteration {loop_count}, "
-            f"state: {self.state.value}, "
-            f"lines: {self.lines_received}"
+            "Main loop iteration %d, state: %s, lines: %d",
+            loop_count, self.state.value, self.lines_received,
           )
 
         # If we're in DOWNLOAD state, run adnl_burn_pkg
-        if self.state == State.DOWNLOAD and self.adnl_process is None:
+        # (adnl_task, not adnl_process: the process only exists once the task
+        # has started it, while adnl_task is set as soon as the burn is requested)
+        if self.state == State.DOWNLOAD and self.adnl_task is None:
           self.logger.info("DOWNLOAD state detected, preparing to run adnl_burn_pkg...")
           # Small delay to ensure board is ready
           await asyncio.sleep(1)
-          await self.run_adnl_burn_pkg()
+          # A state handler may have started the burn during the delay
+          if self.adnl_task is None:
+            self.adnl_task = asyncio.create_task(self.run_adnl_burn_pkg())
+          await self.adnl_task
           # Serial port remains open during and after burn
 
         # If we're in BOOT_VERIFY state, check timeout
         if self.state == State.BOOT_VERIFY and self.burn_complete_time:
-          elapsed = time.time() - self.burn_complete_time
+          elapsed = time.monotonic() - self.burn_complete_time
           if elapsed > self.boot_verify_timeout:
             self.logger.warning(
               f"Boot verification timeout after {elapsed:.1f} seconds. "
@@ -1901,22 +2354,17 @@ class BurnTool:
         # If we're in COMPLETE state, kernel verified - exit immediately
         if self.state == State.COMPLETE:
           if complete_wait_start is None:
-            complete_wait_start = time.time()
-            if self.board_info_output:
-              self.logger.info(
-                "Burn, boot verification, and board information collection complete!"
-              )
-            else:
-              self.logger.info(
-                "Burn and boot verification complete. "
-                "Kernel version verified - boot successful!"
-              )
+            complete_wait_start = time.monotonic()
+            self.logger.info(
+              "Burn and boot verification complete. "
+              "Kernel version verified - boot successful!"
+            )
           # Exit immediately after completion - no need to wait
           break
 
       # Stop continuous Enter if running
       if self.continuous_enter_task and not self.continuous_enter_task.done():
-        self.stop_enter_sending = True
+        self.stop_enter_sending.set()
         self.logger.info("Stopping continuous Enter task...")
         try:
           await asyncio.wait_for(self.continuous_enter_task, timeout=1.0)
@@ -1926,6 +2374,7 @@ class BurnTool:
       # Cancel tasks
       serial_task.cancel()
       timeout_task.cancel()
+      flush_task.cancel()
 
       try:
         await serial_task
@@ -1937,9 +2386,18 @@ class BurnTool:
       except asyncio.CancelledError:
         pass
 
+      try:
+        await flush_task
+      except asyncio.CancelledError:
+        pass
+
     finally:
+      # Also on errors and cancellation: stop the Enter thread, then close
+      # under the write lock so no burst is written to a closed fd
+      self.stop_enter_sending.set()
       if self.serial_conn and self.serial_conn.is_open:
-        self.serial_conn.close()
+        with self.serial_write_lock:
+          self.serial_conn.close()
         self.logger.info("Serial port closed")
 
     success = self.state == State.COMPLETE
@@ -1966,36 +2424,78 @@ class BurnTool:
     return success
 
 
-def validate_image(image_path: Path) -> tuple[bool, str]:
+_MIN_IMAGE_BYTES = 50 << 20  # 50 MB
+_IMAGE_HEADER_BYTES = 512  # Leading bytes checked for content
+
+# Config file name, the locations searched for it (in order) and its required fields
+_CONFIG_NAME = "aml-burn-tool-config.json"
+_CONFIG_CANDIDATES = (
+  os.path.join(_SCRIPT_DIR, _CONFIG_NAME),
+  os.path.join("/etc/aml-burn-tool", _CONFIG_NAME),
+)
+_REQUIRED_FIELDS = ("serial_port", "baudrate")
+# Used when no config file exists
+_DEFAULT_CONFIG = {
+  "serial_port": "/dev/serial-polaris",
+  "baudrate": 921600,
+  "relay_ip": None,
+  "default_image": "polaris.img",
+}
+
+
+def validate_image(image_path: str) -> tuple[bool, str]:
   """Validate image file
   
   Checks:
   - File exists
   - File size is at least 50MB
+  - Header (first 512 bytes) is not all zeros, e.g. a preallocated image still being written
   
   Future enhancements:
-  - Binary header validation
   - File format verification
   - Checksum validation
   
   Args:
-    image_path: Path to image file
+    image_path: Path to image file (as given on the command line)
     
   Returns:
     Tuple of (is_valid, error_message)
   """
-  if not image_path.exists():
+  # One open() covers the existence check; fstat() and a small read give size and header
+  try:
+    fd = os.open(image_path, os.O_RDONLY)
+  except FileNotFoundError:
     return False, f"Image file not found: {image_path}"
+  except OSError as e:
+    return False, f"Cannot open image file: {image_path} ({e})"
+  try:
+    st = os.fstat(fd)
+    head = os.read(fd, _IMAGE_HEADER_BYTES)
+    if hasattr(os, "posix_fadvise"):
+      # Start readahead of the image into the page cache now, so adnl_burn_pkg
+      # finds it cached after the (slow) power cycle and U-Boot handshake
+      try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+      except OSError:
+        pass
+  finally:
+    os.close(fd)
   
-  file_size = image_path.stat().st_size
-  min_size = 50 * 1024 * 1024  # 50 MB in bytes
+  if st.st_size < _MIN_IMAGE_BYTES:
+    return False, f"Image file too small: {image_path} ({st.st_size / (1024*1024):.2f} MB < {_MIN_IMAGE_BYTES / (1024*1024)} MB)"
   
-  if file_size < min_size:
-    return False, f"Image file too small: {image_path} ({file_size / (1024*1024):.2f} MB < {min_size / (1024*1024)} MB)"
+  if not any(head):
+    return False, f"Image file header is all zeros (incomplete or still being written?): {image_path}"
   
   return True, ""
 
 
+def _die(msg: str, code: int = 1):
+  """Write an error message to stderr and exit"""
+  sys.stderr.write(msg + "\n")
+  sys.exit(code)
+
+
 def load_config() -> Dict[str, Any]:
   """Load configuration from config file
   
@@ -2004,102 +2504,107 @@ def load_config() -> Dict[str, Any]:
   2. System-wide: /etc/aml-burn-tool/aml-burn-tool-config.json
   
   Returns:
-    Dict with config values
+    Dict with config values (built-in defaults if no config file is found)
     
   Raises:
-    SystemExit: If config file not found or invalid
+    SystemExit: If config file is invalid
   """
-  config_name = "aml-burn-tool-config.json"
-  
-  # Get script directory
-  script_dir = Path(__file__).parent.absolute()
-  local_config = script_dir / config_name
-  system_config = Path("/etc/aml-burn-tool") / config_name
-  
-  # Try local config first, then system-wide
-  config_path = None
-  if local_config.exists():
-    config_path = local_config
-  elif system_config.exists():
-    config_path = system_config
+  # Try local config (script directory) first, then system-wide
+  for candidate in _CONFIG_CANDIDATES:
+    if os.path.exists(candidate):
+      config_path = candidate
+      break
   else:
-    print("ERROR: Configuration file not found!")
-    print(f"  Expected locations:")
-    print(f"    - {local_config}")
-    print(f"    - {system_config}")
-    print(f"\n  Please copy aml-burn-tool-config.json.example to one of these locations")
-    print(f"  and configure it according to your setup.")
-    sys.exit(1)
+    locations = "".join(f"    - {candidate}\n" for candidate in _CONFIG_CANDIDATES)
+    defaults = ", ".join(f"{key}={value}" for key, value in _DEFAULT_CONFIG.items())
+    sys.stderr.write(
+      "WARNING: Configuration file not found, using built-in defaults\n"
+      f"  ({defaults})\n"
+      "  Expected locations:\n"
+      f"{locations}"
+      "\n  Copy aml-burn-tool-config.json.example to one of these locations\n"
+      "  and configure it according to your setup.\n"
+    )
+    return dict(_DEFAULT_CONFIG)
   
-  # Load and parse config
+  # Load and parse config (orjson.JSONDecodeError subclasses json.JSONDecodeError);
+  # json is only needed here, so it is imported on use
+  import json
   try:
-    with open(config_path, 'r') as f:
-      config = json.load(f)
+    if orjson is not None:
+      with open(config_path, 'rb') as f:
+        config = orjson.loads(f.read())
+    else:
+      with open(config_path, 'r') as f:
+        config = json.load(f)
   except json.JSONDecodeError as e:
-    print(f"ERROR: Invalid JSON in config file: {config_path}")
-    print(f"  {e}")
-    sys.exit(1)
+    _die(f"ERROR: Invalid JSON in config file: {config_path}\n  {e}")
   except Exception as e:
-    print(f"ERROR: Failed to read config file: {config_path}")
-    print(f"  {e}")
-    sys.exit(1)
+    _die(f"ERROR: Failed to read config file: {config_path}\n  {e}")
   
   # Validate required fields
-  required_fields = ["serial_port", "baudrate"]
-  missing_fields = [field for field in required_fields if field not in config]
-  if missing_fields:
-    print(f"ERROR: Missing required fields in config file: {', '.join(missing_fields)}")
-    sys.exit(1)
+  if any(field not in config for field in _REQUIRED_FIELDS):
+    missing_fields = [field for field in _REQUIRED_FIELDS if field not in config]
+    _die(f"ERROR: Missing required fields in config file: {', '.join(missing_fields)}")
   
-  # Validate baudrate is integer
-  if not isinstance(config["baudrate"], int):
-    try:
-      config["baudrate"] = int(config["baudrate"])
-    except (ValueError, TypeError):
-      print(f"ERROR: Invalid baudrate value in config: {config['baudrate']}")
-      sys.exit(1)
+  # Validate baudrate is integer (int() of an int returns it unchanged)
+  try:
+    config["baudrate"] = int(config["baudrate"])
+  except (ValueError, TypeError):
+    _die(f"ERROR: Invalid baudrate value in config: {config['baudrate']}")
   
   return config
 
 
 def main():
   """Main entry point"""
-  # Load config first
-  config = load_config()
+  import argparse
   
+  # Defaults come from the config file, which is only loaded (after parsing,
+  # so --help never needs it) when some option is not given on the command line.
+  # Built-in fallbacks for keys missing from the config, used in help and below:
+  serial_default = _DEFAULT_CONFIG["serial_port"]
+  baudrate_default = _DEFAULT_CONFIG["baudrate"]
+  image_default = _DEFAULT_CONFIG["default_image"]
+
   parser = argparse.ArgumentParser(
     description="Amlogic SBC automated burn tool with event-driven FSM"
   )
   parser.add_argument(
     "--serial",
-    default=config.get("serial_port", "/dev/serial-polaris"),
-    help=f"Serial port device (default from config: {config.get('serial_port', '/dev/serial-polaris')})",
+    help=f"Serial port device (default from config: serial_port, else {serial_default})",
   )
   parser.add_argument(
     "--baudrate",
     type=int,
-    default=config.get("baudrate", 921600),
-    help=f"Serial port baudrate (default from config: {config.get('baudrate', 921600)})",
+    help=f"Serial port baudrate (default from config: baudrate, else {baudrate_default})",
   )
   parser.add_argument(
     "--relay",
-    default=config.get("relay_ip"),
-    help=f"Tasmota relay IP address (default from config: {config.get('relay_ip', 'None')})",
+    help="Tasmota relay IP address, empty to disable (default from config: relay_ip, else None)",
   )
   parser.add_argument(
     "--image",
-    default=config.get("default_image", "polaris.img"),
-    help=f"Image file path (default from config: {config.get('default_image', 'polaris.img')})",
+    help=f"Image file path (default from config: default_image, else {image_default})",
   )
 
   args = parser.parse_args()
 
+  if None in (args.serial, args.baudrate, args.relay, args.image):
+    config = load_config()
+    if args.serial is None:
+      args.serial = config.get("serial_port", serial_default)
+    if args.baudrate is None:
+      args.baudrate = config.get("baudrate", baudrate_default)
+    if args.relay is None:
+      args.relay = config.get("relay_ip")
+    if args.image is None:
+      args.image = config.get("default_image", image_default)
+
   # Validate image file before starting
-  image_path = Path(args.image)
-  is_valid, error_msg = validate_image(image_path)
+  is_valid, error_msg = validate_image(args.image)
   if not is_valid:
-    print(f"ERROR: {error_msg}")
-    sys.exit(1)
+    _die(f"ERROR: {error_msg}")
 
   tool = BurnTool(
     serial_port=args.serial,
@@ -2109,7 +2614,30 @@ def main():
   )
 
   try:
-    success = asyncio.run(tool.run())
+    # Fail fast on obvious setup errors without starting an event loop
+    ok, msg = tool.precheck()
+    if not ok:
+      tool.logger.error(f"Pre-check failed: {msg}")
+      sys.exit(1)
+
+    try:
+      # Optional libuv-based event loop with lower per-wakeup overhead
+      import uvloop
+    except ImportError:
+      uvloop = None
+
+    if sys.version_info >= (3, 11):
+      loop_factory = uvloop.new_event_loop if uvloop is not None else None
+      with asyncio.Runner(loop_factory=loop_factory) as runner:
+        if sys.version_info >= (3, 12):
+          # Eager tasks run synchronously until their first suspension point,
+          # saving an event loop round trip for short-lived FSM tasks
+          runner.get_loop().set_task_factory(asyncio.eager_task_factory)
+        success = runner.run(tool.run())
+    else:
+      if uvloop is not None:
+        uvloop.install()
+      success = asyncio.run(tool.run())
     sys.exit(0 if success else 1)
   except KeyboardInterrupt:
     print("\nInterrupted by user")
@@ -2120,6 +2648,8 @@ def main():
 
     traceback.print_exc()
     sys.exit(1)
+  finally:
+    tool.close()
 
 
 if __name__ == "__main__":
@@ -46,11 +46,6 @@ class BoardInfoCollector:
         "PATTERN": "",
         "FSM": "",
       }
-  
-  @property
-  def COLORS(self):
-    """Get color codes (property to check TTY each time)"""
-    return self._get_colors()
 
   # Pattern definitions
   PATTERNS = {
@@ -75,6 +70,8 @@ class BoardInfoCollector:
     self.serial_conn = None
     self.open_md = open_md
     self.open_pdf = open_pdf
+    # Console color codes (empty strings when stdout is not a TTY)
+    self.COLORS = self._get_colors()
     
     # Setup log directory
     if log_dir: